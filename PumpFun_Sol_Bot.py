@@ -1,7 +1,11 @@
 import os
+import json
 import time
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+import websockets
+from cachetools import TTLCache
+from selectolax.parser import HTMLParser
 from bxsolana_trader import Trader, Wallet, Market
 from dotenv import load_dotenv
 
@@ -15,12 +19,27 @@ PROFIT_TARGET_2 = 0.25  # Another 25% profit after target 1
 STOP_LOSS = 0.10  # 10% decrease in market cap
 BONDING_CRITICAL = 0.75  # 75% of the bonding curve reached
 TIMEOUT = 3600  # 1 hour trade timeout
+SCRAPE_INTERVAL = 300  # Scrape pump.fun every 5 minutes
+STREAM_RETRY_DELAY = 1  # Seconds before the first price stream reconnect, doubled per failure
+STREAM_RETRY_MAX_DELAY = 60  # Upper bound on the reconnect backoff
+
+# Price feed WebSocket (Birdeye by default)
+PRICE_WS_URL = os.getenv("PRICE_WS_URL", "wss://public-api.birdeye.so/socket/solana")
+BIRDEYE_API_KEY = os.getenv("BIRDEYE_API_KEY")
+if not BIRDEYE_API_KEY:
+    raise ValueError("Birdeye API key is not set. Please set the BIRDEYE_API_KEY in the environment.")
 
 # Load wallet mnemonic from ENV
 WALLET_MNEMONIC = os.getenv("WALLET_MNEMONIC")
 if not WALLET_MNEMONIC:
     raise ValueError("Wallet mnemonic is not set. Please set the WALLET_MNEMONIC in the environment.")
 
+# Pairs already bought recently, so later scrapes don't re-buy them
+SEEN = TTLCache(maxsize=4096, ttl=3600)
+
+# Last parsed scrape, reused while pump.fun answers 304 Not Modified
+_scrape_cache = {"etag": None, "tokens": []}
+
 # Initialize Wallet and Trader
 wallet = Wallet.from_mnemonic(WALLET_MNEMONIC)
 trader = Trader(wallet=wallet)
@@ -28,25 +47,32 @@ trader = Trader(wallet=wallet)
 def scrape_pump_fun():
     """Scrape pump.fun for new tokens."""
     url = "https://pump.fun/"  # Update with the correct URL if necessary
-    response = requests.get(url)
+    headers = {"If-None-Match": _scrape_cache["etag"]} if _scrape_cache["etag"] else {}
+    response = requests.get(url, headers=headers)
+    if response.status_code == 304:
+        return _scrape_cache["tokens"]
     if response.status_code != 200:
         print("Failed to scrape pump.fun")
         return []
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    # selectolax's C (Lexbor) parser is much faster than BeautifulSoup's pure-Python html.parser
+    tree = HTMLParser(response.content)
 
     # Adjust this logic based on the structure of pump.fun
     tokens = []
-    for token_entry in soup.select(".token-entry"):  # Replace with actual HTML structure
+    for token_entry in tree.css(".token-entry"):  # Replace with actual HTML structure
         token = {
-            "name": token_entry.select_one(".token-name").text.strip(),  # Adjust class names
-            "pair": token_entry.select_one(".token-pair").text.strip(),
-            "bonding_curve": float(token_entry.select_one(".bonding-curve").text.strip("%")) / 100,
+            "name": token_entry.css_first(".token-name").text(strip=True),  # Adjust class names
+            "pair": token_entry.css_first(".token-pair").text(strip=True),
+            "bonding_curve": float(token_entry.css_first(".bonding-curve").text(strip=True).strip("%")) / 100,
         }
         tokens.append(token)
 
     # Filter tokens with favorable bonding curves
-    return [token for token in tokens if token["bonding_curve"] < 0.5]
+    tokens = [token for token in tokens if token["bonding_curve"] < 0.5]
+    _scrape_cache["etag"] = response.headers.get("ETag")
+    _scrape_cache["tokens"] = tokens
+    return tokens
 
 def monitor_market(token):
     """Monitor the market cap and bonding curve for a token."""
@@ -59,61 +85,101 @@ def monitor_market(token):
     }
     return market_data
 
-def execute_trade(strategy):
+async def stream_market(token, queue):
+    """Push live market data for a token into a queue, reconnecting with backoff when the stream drops."""
+    url = f"{PRICE_WS_URL}?x-api-key={BIRDEYE_API_KEY}"
+    delay = STREAM_RETRY_DELAY
+    while True:
+        try:
+            async with websockets.connect(url, subprotocols=["echo-protocol"]) as ws:
+                await ws.send(json.dumps({
+                    "type": "SUBSCRIBE_PRICE",
+                    "data": {"queryType": "simple", "chartType": "1m", "address": token["pair"], "currency": "pair"},
+                }))
+                delay = STREAM_RETRY_DELAY
+                async for message in ws:
+                    update = json.loads(message)
+                    if update.get("type") == "PRICE_DATA":
+                        await queue.put({"price": float(update["data"]["c"]), "bonding_curve": token["bonding_curve"]})
+            print(f"Price stream for {token['pair']} closed. Reconnecting in {delay}s.")
+        except Exception as e:
+            print(f"Price stream for {token['pair']} failed: {e}. Reconnecting in {delay}s.")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, STREAM_RETRY_MAX_DELAY)
+
+async def execute_trade(strategy):
     """Execute the trading strategy."""
     token = strategy["token"]
+    pair = token["pair"]
     buy_price = strategy["buy_price"]
     quantity = strategy["quantity"]
-
-    # Monitor until conditions are met
-    while True:
-        data = monitor_market(token)
-        market_cap = data["market_cap"]
-        bonding_curve = data["bonding_curve"]
-        current_price = data["price"]
-
-        # Stop Loss Condition
-        if market_cap <= strategy["initial_market_cap"] * (1 - STOP_LOSS):
-            print("Stop loss triggered. Selling all tokens.")
-            trader.sell(symbol=token["pair"], quantity=quantity)
-            break
-
-        # Profit Target 1
-        if current_price >= buy_price * (1 + PROFIT_TARGET_1) and not strategy["target_1_hit"]:
-            sell_quantity = quantity * 0.5
-            print(f"Profit target 1 reached. Selling {sell_quantity} tokens.")
-            trader.sell(symbol=token["pair"], quantity=sell_quantity)
-            strategy["target_1_hit"] = True
-            quantity -= sell_quantity
-
-        # Profit Target 2
-        if strategy["target_1_hit"] and current_price >= buy_price * (1 + PROFIT_TARGET_2):
-            sell_quantity = quantity * 0.75
-            print(f"Profit target 2 reached. Selling {sell_quantity} tokens.")
-            trader.sell(symbol=token["pair"], quantity=sell_quantity)
-            break
-
-        # Bonding Curve Condition
-        if bonding_curve >= BONDING_CRITICAL:
-            sell_quantity = quantity * 0.75
-            print(f"Critical bonding curve reached. Selling {sell_quantity} tokens.")
-            trader.sell(symbol=token["pair"], quantity=sell_quantity)
-            quantity -= sell_quantity
-
-        # Timeout
-        if time.time() - strategy["start_time"] > TIMEOUT:
-            print("Trade timeout reached. Exiting trade.")
-            trader.sell(symbol=token["pair"], quantity=quantity)
-            break
-
-        time.sleep(30)  # Monitor every 30 seconds
-
-def main():
+    target_2_hit = False
+    bonding_exit_hit = False
+
+    queue = asyncio.Queue()
+    feed = asyncio.create_task(stream_market(token, queue), name=f"Price stream {pair}")
+    try:
+        while True:
+            remaining = strategy["deadline"] - time.time()
+            if remaining <= 0:
+                print(f"Trade timeout reached for {pair}. Exiting trade.")
+                trader.sell(symbol=pair, quantity=quantity)
+                return
+
+            # The stream reconnects on its own; waiting is bounded by the deadline so the timeout still fires
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                continue
+            current_price = data["price"]
+
+            # Stop Loss Condition; supply is fixed, so the market-cap stop is the same move in price
+            if current_price <= buy_price * (1 - STOP_LOSS):
+                print("Stop loss triggered. Selling all remaining tokens.")
+                trader.sell(symbol=pair, quantity=quantity)
+                return
+
+            # Profit Target 1
+            if current_price >= buy_price * (1 + PROFIT_TARGET_1) and not strategy["target_1_hit"]:
+                sell_quantity = quantity * 0.5
+                print(f"Profit target 1 reached. Selling {sell_quantity} tokens.")
+                trader.sell(symbol=pair, quantity=sell_quantity)
+                strategy["target_1_hit"] = True
+                quantity -= sell_quantity
+
+            # Profit Target 2; the rest stays under the stop loss and the timeout
+            if strategy["target_1_hit"] and not target_2_hit and current_price >= buy_price * (1 + PROFIT_TARGET_2):
+                sell_quantity = quantity * 0.75
+                print(f"Profit target 2 reached. Selling {sell_quantity} tokens.")
+                trader.sell(symbol=pair, quantity=sell_quantity)
+                target_2_hit = True
+                quantity -= sell_quantity
+
+            # Bonding Curve Condition
+            if data["bonding_curve"] >= BONDING_CRITICAL and not bonding_exit_hit:
+                sell_quantity = quantity * 0.75
+                print(f"Critical bonding curve reached. Selling {sell_quantity} tokens.")
+                trader.sell(symbol=pair, quantity=sell_quantity)
+                bonding_exit_hit = True
+                quantity -= sell_quantity
+    finally:
+        feed.cancel()
+
+def report_failure(task):
+    """Print the error of a finished background task instead of letting it vanish."""
+    if not task.cancelled() and task.exception():
+        print(f"{task.get_name()} failed: {task.exception()!r}")
+
+async def main():
     """Main function to execute trading bot."""
+    open_trades = set()  # Keeps the running trade tasks referenced until they finish
     while True:
         # Find new tokens
-        new_tokens = scrape_pump_fun()
+        new_tokens = await asyncio.to_thread(scrape_pump_fun)
         for token in new_tokens:
+            if token["pair"] in SEEN:
+                continue
+            SEEN[token["pair"]] = True
             print(f"Found new token: {token['name']}")
 
             # Get initial market data
@@ -127,18 +193,23 @@ def main():
             print(f"Buying {quantity} tokens of {token['pair']} at {buy_price} SOL")
             trader.buy(symbol=token["pair"], quantity=quantity)
 
-            # Start monitoring
+            # Run the exits for the position until they complete or it times out
+            start_time = time.time()
             strategy = {
                 "token": token,
                 "buy_price": buy_price,
                 "quantity": quantity,
                 "initial_market_cap": market_cap,
+                "start_time": start_time,
+                "deadline": start_time + TIMEOUT,
                 "target_1_hit": False,
-                "start_time": time.time(),
             }
-            execute_trade(strategy)
+            task = asyncio.create_task(execute_trade(strategy), name=f"Trade {token['pair']}")
+            open_trades.add(task)
+            task.add_done_callback(open_trades.discard)
+            task.add_done_callback(report_failure)
 
-        time.sleep(300)  # Scrape pump.fun every 5 minutes
+        await asyncio.sleep(SCRAPE_INTERVAL)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,9 +1,15 @@
 import time
+import asyncio
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import logging
 import os
+import queue
+import threading
+from functools import partial
+from binance import ThreadedWebsocketManager
 from binance.client import Client
 from binance.exceptions import BinanceAPIException, BinanceOrderException
 from datetime import datetime
@@ -11,10 +17,32 @@ from datetime import datetime
 # Initialize and Adjust trading fee percentage
 FEE_PERCENTAGE = 0.001  # 0.1% trading fee
 
+# Seconds before the cached exchange info is downloaded again
+EXCHANGE_INFO_TTL = 3600
+
+# Symbol -> symbol info map built from the last exchange info download
+_exchange_info_cache = {"fetched_at": 0.0, "symbols": {}}
+
+# Closed klines are cached on disk per (symbol, interval) so warm starts only fetch new candles
+KLINE_CACHE_DIR = '.cache'
+KLINE_CACHE_MAX_ROWS = 5000
+
+# Kline interval lengths in seconds
+INTERVAL_SECONDS = {'1m': 60, '3m': 180, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '2h': 7200,
+                    '4h': 14400, '6h': 21600, '8h': 28800, '12h': 43200, '1d': 86400, '3d': 259200,
+                    '1w': 604800, '1M': 2592000}
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
+# Shared HTTP session so Telegram and other ad-hoc requests reuse keep-alive TCP/TLS connections
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1))
+
+# sendMessage URL per bot token, built once
+_telegram_urls = {}
+
 def send_telegram_message(message, telegram_token, chat_id):
     """
     Send a message to a Telegram chat.
@@ -27,38 +55,125 @@ def send_telegram_message(message, telegram_token, chat_id):
     if not telegram_token or not chat_id:
         return False
 
-    url = f"https://api.telegram.org/bot{telegram_token}/sendMessage"
+    url = _telegram_urls.get(telegram_token)
+    if url is None:
+        url = _telegram_urls[telegram_token] = f"https://api.telegram.org/bot{telegram_token}/sendMessage"
     payload = {
         "chat_id": chat_id,
         "text": message
     }
-    response = requests.post(url, data=payload)
+    response = _session.post(url, json=payload, timeout=5)
     return response.json()
 
-def get_ema(symbol, interval, length, client):
+def load_closed_klines(symbol, interval, limit, client):
+    """
+    Load closed klines from the on-disk cache, fetching only the candles closed since the last cached one.
+
+    Parameters:
+    - symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
+    - interval (str): Kline interval (e.g., '1h').
+    - limit (int): Minimum number of closed candles required.
+    - client (Client): Binance API client instance.
+
+    Returns:
+    - pd.DataFrame: Closed candles with 'ts' (open time in ms) and 'close' columns.
+    """
+    cache_path = os.path.join(KLINE_CACHE_DIR, f"{symbol}_{interval}.parquet")
+    df = pd.read_parquet(cache_path) if os.path.exists(cache_path) else None
+
+    if df is not None and len(df) >= limit:
+        interval_ms = INTERVAL_SECONDS.get(interval, 300) * 1000
+        since = int(df['ts'].iloc[-1]) + interval_ms
+        oldest = int(time.time() * 1000) - KLINE_CACHE_MAX_ROWS * interval_ms
+        if since < oldest:
+            # The cache is older than the rows it keeps; fetch only that window instead of the whole gap
+            since, df = oldest, None
+        klines = client.get_historical_klines(symbol, interval, since)
+    else:
+        df = None
+        klines = client.get_klines(symbol=symbol, interval=interval, limit=limit + 1)
+
+    # Only cache candles whose close time has passed
+    now_ms = int(time.time() * 1000)
+    closed = [entry for entry in klines if entry[6] < now_ms]
+    new = pd.DataFrame({'ts': [int(entry[0]) for entry in closed], 'close': [float(entry[4]) for entry in closed]})
+    df = new if df is None else pd.concat([df, new]).drop_duplicates('ts', keep='last')
+    df = df.tail(KLINE_CACHE_MAX_ROWS).reset_index(drop=True)
+
+    os.makedirs(KLINE_CACHE_DIR, exist_ok=True)
+    df.to_parquet(cache_path, index=False)
+    return df
+
+def _drain_telegram_queue():
+    """Send queued Telegram notifications from a background thread."""
+    while True:
+        message, telegram_token, chat_id = _notify_q.get()
+        try:
+            send_telegram_message(message, telegram_token, chat_id)
+        except Exception as e:
+            logger.error(f"Failed to send Telegram message: {e}")
+
+def queue_telegram_message(message, telegram_token, chat_id):
+    """
+    Queue a Telegram message for the background sender so the trading loop never waits on the HTTP call.
+
+    Parameters:
+    - message (str): The message to send.
+    - telegram_token (str): Telegram bot token.
+    - chat_id (str): Telegram chat ID.
+    """
+    if telegram_token and chat_id:
+        _notify_q.put((message, telegram_token, chat_id))
+
+# Notifications are produced by the trading loop and drained by a daemon thread
+_notify_q = queue.Queue()
+threading.Thread(target=_drain_telegram_queue, daemon=True).start()
+
+def get_emas(symbol, interval, short_length, long_length, client):
     """
-    Calculate the Exponential Moving Average (EMA) for a given symbol and interval.
+    Calculate the short and long Exponential Moving Averages (EMA) of the closed candles for a given symbol and interval.
+
+    Both EMAs come from a single kline load and are used once at startup as seeds;
+    later candles are folded in with update_ema.
 
     Parameters:
     - symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
     - interval (str): Kline interval (e.g., '1h').
-    - length (int): Period over which to calculate EMA.
+    - short_length (int): Period of the short EMA.
+    - long_length (int): Period of the long EMA.
     - client (Client): Binance API client instance.
 
     Returns:
-    - float: The calculated EMA value.
+    - tuple: (short EMA, long EMA, last closing price).
+    """
+    # Enough closed candles for the longer EMA, mostly served from the kline cache
+    closes = load_closed_klines(symbol, interval, max(short_length, long_length)*3, client)['close']
+    short_ema = closes.ewm(span=short_length, adjust=False).mean().iloc[-1]
+    long_ema = closes.ewm(span=long_length, adjust=False).mean().iloc[-1]
+    return short_ema, long_ema, closes.iloc[-1]
+
+def update_ema(ema, price, length):
+    """
+    Fold one new candle close into an EMA.
+
+    Parameters:
+    - ema (float): The previous EMA value.
+    - price (float): Closing price of the new candle.
+    - length (int): Period of the EMA.
+
+    Returns:
+    - float: The updated EMA value.
     """
-    # Fetch enough klines to calculate EMA
-    klines = client.get_klines(symbol=symbol, interval=interval, limit=length*2)
-    closes = [float(entry[4]) for entry in klines]
-    df = pd.DataFrame(closes, columns=['Close'])
-    ema = df['Close'].ewm(span=length, adjust=False).mean()
-    return ema.iloc[-1]
+    alpha = 2 / (length + 1)
+    return alpha * price + (1 - alpha) * ema
 
 def get_symbol_info(symbol, client):
     """
     Retrieve symbol information from Binance exchange info.
 
+    The full exchange info is downloaded at most once per EXCHANGE_INFO_TTL seconds
+    and indexed by symbol, so repeated lookups are a dict access.
+
     Parameters:
     - symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
     - client (Client): Binance API client instance.
@@ -66,9 +181,11 @@ def get_symbol_info(symbol, client):
     Returns:
     - dict: Symbol information.
     """
-    exchange_info = client.get_exchange_info()
-    symbol_info = next((item for item in exchange_info['symbols'] if item['symbol'] == symbol), None)
-    return symbol_info
+    if time.time() - _exchange_info_cache["fetched_at"] > EXCHANGE_INFO_TTL:
+        exchange_info = client.get_exchange_info()
+        _exchange_info_cache["symbols"] = {item['symbol']: item for item in exchange_info['symbols']}
+        _exchange_info_cache["fetched_at"] = time.time()
+    return _exchange_info_cache["symbols"].get(symbol)
 
 def get_asset_balance(asset_symbol, client):
     """
@@ -84,21 +201,79 @@ def get_asset_balance(asset_symbol, client):
     balance = client.get_asset_balance(asset=asset_symbol)
     return float(balance['free']) if balance and 'free' in balance else 0.0
 
-def get_current_price(symbol, client):
+def handle_kline_message(msg, state):
     """
-    Get the current price of a trading pair.
+    Fold each closed candle from the kline stream into the EMA state.
+
+    Parameters:
+    - msg (dict): Kline stream message.
+    - state (dict): Shared market and account state kept current by the WebSocket streams.
+    """
+    if msg.get('e') == 'error':
+        logger.error(f"Kline stream error: {msg.get('m')}")
+        return
+
+    kline = msg['k']
+    if not kline['x']:  # only closed candles change the EMA
+        return
+
+    close = float(kline['c'])
+    state['short_ema'] = update_ema(state['short_ema'], close, state['short_ema_period'])
+    state['long_ema'] = update_ema(state['long_ema'], close, state['long_ema_period'])
+
+def handle_ticker_message(msg, state):
+    """
+    Record the latest traded price from the symbol ticker stream.
+
+    Parameters:
+    - msg (dict): Symbol ticker stream message.
+    - state (dict): Shared market and account state kept current by the WebSocket streams.
+    """
+    if msg.get('e') == 'error':
+        logger.error(f"Ticker stream error: {msg.get('m')}")
+        return
+
+    state['current_price'] = float(msg['c'])
+
+def handle_user_message(msg, state):
+    """
+    Apply free balance changes from the user data stream.
+
+    Parameters:
+    - msg (dict): User data stream message.
+    - state (dict): Shared market and account state kept current by the WebSocket streams.
+    """
+    if msg.get('e') == 'error':
+        logger.error(f"User stream error: {msg.get('m')}")
+        return
+
+    if msg.get('e') == 'outboundAccountPosition':
+        for balance in msg['B']:
+            state['balances'][balance['a']] = float(balance['f'])
+
+def measure_latency(client, samples=5):
+    """
+    Measure the REST round-trip time to the Binance API.
+
+    Logged at startup so the effect of where the bot is hosted (ideally in the
+    same cloud region as the exchange, e.g. AWS ap-northeast-1) can be checked.
 
     Parameters:
-    - symbol (str): Trading pair symbol (e.g., 'BTCUSDT').
     - client (Client): Binance API client instance.
+    - samples (int): Number of pings to time.
 
     Returns:
-    - float: Current price.
+    - float: Median round-trip time in milliseconds.
     """
-    ticker = client.get_symbol_ticker(symbol=symbol)
-    return float(ticker['price'])
-
-def main():
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        client.ping()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+async def main():
     parser = argparse.ArgumentParser(description="Binance Spot Trading Bot based on EMA crossover.")
     parser.add_argument('symbol', type=str, help="Trading pair, e.g., 'BTCUSDT'.")
     parser.add_argument('interval', type=str, help="Interval for fetching data, e.g., '1h', '3d', '1m'.")
@@ -124,10 +299,20 @@ def main():
         logger.error("Binance API key and secret must be provided via command line or environment variables.")
         return
 
-    client = Client(api_key, api_secret)
+    client = Client(api_key, api_secret, requests_params={'timeout': 10})
+
+    # Blocking python-binance calls run in the default executor so independent requests overlap
+    loop = asyncio.get_running_loop()
+
+    latency = await loop.run_in_executor(None, measure_latency, client)
+    logger.info(f"Binance REST round-trip: {latency:.1f} ms")
 
-    # Get symbol info
-    symbol_info = get_symbol_info(args.symbol, client)
+    # Get symbol info and the EMA seeds together; the last close seeds the price until the ticker stream updates it
+    symbol_info, (short_ema, long_ema, current_price) = await asyncio.gather(
+        loop.run_in_executor(None, get_symbol_info, args.symbol, client),
+        loop.run_in_executor(None, get_emas, args.symbol, args.interval,
+                             args.short_ema_period, args.long_ema_period, client),
+    )
     if not symbol_info:
         logger.error(f"Symbol {args.symbol} not found.")
         return
@@ -149,141 +334,176 @@ def main():
     buy_cost = 0    # cost of the buy in quote currency
     i = 0
 
-    while True:
-        try:
-            current_price = get_current_price(args.symbol, client)
-            short_ema = get_ema(args.symbol, args.interval, args.short_ema_period, client)
-            long_ema = get_ema(args.symbol, args.interval, args.long_ema_period, client)
-
-            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-
-            # Check for EMA crossovers
-            if short_ema > long_ema and last_cross != 'above':
-                quote_balance = get_asset_balance(quote_asset, client)
-                trade_amount = args.trade_amount or quote_balance
-                trade_amount = min(trade_amount, quote_balance)
-                if trade_amount >= min_notional:
-                    logger.info(f"{timestamp} - Short EMA crossed above Long EMA. Placing a BUY order.")
-                    send_telegram_message(f"{timestamp} - Short EMA crossed above Long EMA. Placing a BUY order.",
-                                          args.telegram_token, args.telegram_chat_id)
-                    if args.dry_run:
-                        buy_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(trade_amount), 'fills': [{'qty': str(trade_amount / current_price)}]}
-                        logger.info("Dry run mode: Buy order simulated.")
-                    else:
-                        buy_order = client.order_market_buy(symbol=args.symbol, quoteOrderQty=trade_amount)
-                    buy_cost = float(buy_order['cummulativeQuoteQty'])  # total cost in quote currency
-                    buy_amount = sum([float(fill['qty']) for fill in buy_order['fills']])
-                    buy_price = buy_cost / buy_amount  # average buy price
-
-                    if buy_order['status'] == 'FILLED':
-                        last_cross = 'above'
-
-            elif short_ema < long_ema and last_cross != 'below':
-                base_balance = get_asset_balance(base_asset, client)
-                if base_balance >= min_qty:
-                    base_balance = base_balance - (base_balance % step_size)  # adjust to step size
-                    if base_balance >= min_qty:
-                        logger.info(f"{timestamp} - Short EMA crossed below Long EMA. Placing a SELL order.")
-                        send_telegram_message(f"{timestamp} - Short EMA crossed below Long EMA. Placing a SELL order.",
-                                              args.telegram_token, args.telegram_chat_id)
-                        if args.dry_run:
-                            sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
-                            logger.info("Dry run mode: Sell order simulated.")
-                        else:
-                            sell_order = client.order_market_sell(symbol=args.symbol, quantity=base_balance)
-                        sell_revenue = float(sell_order['cummulativeQuoteQty'])  # total received in quote currency
-                        fee = FEE_PERCENTAGE * sell_revenue
-                        pnl = (sell_revenue - fee) - buy_cost  # calculate PNL
-                        logger.info(f"PNL: {pnl:.2f} {quote_asset}")
-                        send_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
-                        buy_amount = 0
-                        buy_cost = 0
-                        buy_price = None
-
-                        if sell_order['status'] == 'FILLED':
-                            last_cross = 'below'
-
-            # Check for stop loss and take profit
-            if buy_price:
-                if current_price <= buy_price * (1 - args.stop_loss_pct):
-                    base_balance = get_asset_balance(base_asset, client)
-                    if base_balance >= min_qty:
-                        base_balance = base_balance - (base_balance % step_size)  # adjust to step size
-                        logger.info(f"{timestamp} - Stop loss triggered. Placing a SELL order.")
-                        send_telegram_message(f"{timestamp} - Stop loss triggered. Placing a SELL order.",
-                                              args.telegram_token, args.telegram_chat_id)
+    base_balance, quote_balance = await asyncio.gather(
+        loop.run_in_executor(None, get_asset_balance, base_asset, client),
+        loop.run_in_executor(None, get_asset_balance, quote_asset, client),
+    )
+
+    # Seed price, EMAs and balances over REST once; the WebSocket streams keep them current
+    state = {
+        'current_price': current_price,
+        'short_ema': short_ema,
+        'long_ema': long_ema,
+        'short_ema_period': args.short_ema_period,
+        'long_ema_period': args.long_ema_period,
+        'balances': {base_asset: base_balance, quote_asset: quote_balance},
+    }
+
+    twm = ThreadedWebsocketManager(api_key=api_key, api_secret=api_secret)
+    twm.start()
+    twm.start_kline_socket(callback=partial(handle_kline_message, state=state),
+                           symbol=args.symbol, interval=args.interval)
+    twm.start_symbol_ticker_socket(callback=partial(handle_ticker_message, state=state), symbol=args.symbol)
+    twm.start_user_socket(callback=partial(handle_user_message, state=state))
+
+    sleep_duration = INTERVAL_SECONDS.get(args.interval, 300)
+    # Deadlines are on the monotonic clock so wall-clock (NTP) jumps cannot shorten or stretch a cycle.
+    # The first one is aligned to the next interval boundary, so each cycle runs right after a kline closes
+    next_deadline = time.monotonic() + (sleep_duration - time.time() % sleep_duration)
+
+    try:
+        while True:
+            try:
+                # Read the pushed local state only; no REST calls per iteration
+                current_price = state['current_price']
+                short_ema = state['short_ema']
+                long_ema = state['long_ema']
+
+                timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+                # Check for EMA crossovers
+                if short_ema > long_ema and last_cross != 'above':
+                    quote_balance = state['balances'].get(quote_asset, 0.0)
+                    trade_amount = args.trade_amount or quote_balance
+                    trade_amount = min(trade_amount, quote_balance)
+                    if trade_amount >= min_notional:
+                        logger.info(f"{timestamp} - Short EMA crossed above Long EMA. Placing a BUY order.")
+                        queue_telegram_message(f"{timestamp} - Short EMA crossed above Long EMA. Placing a BUY order.",
+                                               args.telegram_token, args.telegram_chat_id)
                         if args.dry_run:
-                            sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
-                            logger.info("Dry run mode: Stop loss sell order simulated.")
+                            buy_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(trade_amount), 'fills': [{'qty': str(trade_amount / current_price)}]}
+                            logger.info("Dry run mode: Buy order simulated.")
                         else:
-                            sell_order = client.order_market_sell(symbol=args.symbol, quantity=base_balance)
-                        sell_revenue = float(sell_order['cummulativeQuoteQty'])
-                        fee = FEE_PERCENTAGE * sell_revenue
-                        pnl = (sell_revenue - fee) - buy_cost
-                        logger.info(f"PNL: {pnl:.2f} {quote_asset}")
-                        send_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
-                        buy_amount = 0
-                        buy_cost = 0
-                        buy_price = None
-                        last_cross = 'below'  # reset last_cross to prevent immediate re-buy
-
-                elif current_price >= buy_price * (1 + args.take_profit_pct):
-                    base_balance = get_asset_balance(base_asset, client)
+                            buy_order = await loop.run_in_executor(
+                                None, partial(client.order_market_buy, symbol=args.symbol, quoteOrderQty=trade_amount))
+                        buy_cost = float(buy_order['cummulativeQuoteQty'])  # total cost in quote currency
+                        buy_amount = sum([float(fill['qty']) for fill in buy_order['fills']])
+                        buy_price = buy_cost / buy_amount  # average buy price
+
+                        if buy_order['status'] == 'FILLED':
+                            last_cross = 'above'
+
+                elif short_ema < long_ema and last_cross != 'below':
+                    base_balance = state['balances'].get(base_asset, 0.0)
                     if base_balance >= min_qty:
                         base_balance = base_balance - (base_balance % step_size)  # adjust to step size
-                        logger.info(f"{timestamp} - Take profit target reached. Placing a SELL order.")
-                        send_telegram_message(f"{timestamp} - Take profit target reached. Placing a SELL order.",
-                                              args.telegram_token, args.telegram_chat_id)
-                        if args.dry_run:
-                            sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
-                            logger.info("Dry run mode: Take profit sell order simulated.")
-                        else:
-                            sell_order = client.order_market_sell(symbol=args.symbol, quantity=base_balance)
-                        sell_revenue = float(sell_order['cummulativeQuoteQty'])
-                        fee = FEE_PERCENTAGE * sell_revenue
-                        pnl = (sell_revenue - fee) - buy_cost
-                        logger.info(f"PNL: {pnl:.2f} {quote_asset}")
-                        send_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
-                        buy_amount = 0
-                        buy_cost = 0
-                        buy_price = None
-                        last_cross = 'below'  # reset last_cross to prevent immediate re-buy
-
-            print_message = f"{timestamp} - Current Price: {current_price}, Short EMA: {short_ema}, Long EMA: {long_ema}"
-            logger.info(print_message)
-
-            i += 1
-            if i >= args.notify_interval:
-                send_telegram_message(print_message, args.telegram_token, args.telegram_chat_id)
-                i = 0
-
-            # Sleep until next interval
-            interval_mapping = {'1m': 60, '3m': 180, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '2h': 7200,
-                                '4h': 14400, '6h': 21600, '8h': 28800, '12h': 43200, '1d': 86400, '3d': 259200,
-                                '1w': 604800, '1M': 2592000}
-            sleep_duration = interval_mapping.get(args.interval, 300)
-            time_to_sleep = sleep_duration - (time.time() % sleep_duration)
-            time.sleep(time_to_sleep)
-
-        except BinanceAPIException as e:
-            logger.error(f"Binance API Exception: {e}")
-            send_telegram_message(f"Binance API Exception: {e}", args.telegram_token, args.telegram_chat_id)
-            time.sleep(60)
-        except BinanceOrderException as e:
-            logger.error(f"Binance Order Exception: {e}")
-            send_telegram_message(f"Binance Order Exception: {e}", args.telegram_token, args.telegram_chat_id)
-            time.sleep(60)
-        except requests.exceptions.ReadTimeout:
-            logger.error("Encountered ReadTimeout. Sleeping for a minute before retrying...")
-            send_telegram_message("Encountered ReadTimeout. Sleeping for a minute before retrying...", args.telegram_token, args.telegram_chat_id)
-            time.sleep(60)
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            send_telegram_message(f"Unexpected error: {e}", args.telegram_token, args.telegram_chat_id)
-            time.sleep(60)
+                        if base_balance >= min_qty:
+                            logger.info(f"{timestamp} - Short EMA crossed below Long EMA. Placing a SELL order.")
+                            queue_telegram_message(f"{timestamp} - Short EMA crossed below Long EMA. Placing a SELL order.",
+                                                   args.telegram_token, args.telegram_chat_id)
+                            if args.dry_run:
+                                sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
+                                logger.info("Dry run mode: Sell order simulated.")
+                            else:
+                                sell_order = await loop.run_in_executor(
+                                    None, partial(client.order_market_sell, symbol=args.symbol, quantity=base_balance))
+                            sell_revenue = float(sell_order['cummulativeQuoteQty'])  # total received in quote currency
+                            fee = FEE_PERCENTAGE * sell_revenue
+                            pnl = (sell_revenue - fee) - buy_cost  # calculate PNL
+                            logger.info(f"PNL: {pnl:.2f} {quote_asset}")
+                            queue_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
+                            buy_amount = 0
+                            buy_cost = 0
+                            buy_price = None
+
+                            if sell_order['status'] == 'FILLED':
+                                last_cross = 'below'
+
+                # Check for stop loss and take profit
+                if buy_price:
+                    if current_price <= buy_price * (1 - args.stop_loss_pct):
+                        base_balance = state['balances'].get(base_asset, 0.0)
+                        if base_balance >= min_qty:
+                            base_balance = base_balance - (base_balance % step_size)  # adjust to step size
+                            logger.info(f"{timestamp} - Stop loss triggered. Placing a SELL order.")
+                            queue_telegram_message(f"{timestamp} - Stop loss triggered. Placing a SELL order.",
+                                                   args.telegram_token, args.telegram_chat_id)
+                            if args.dry_run:
+                                sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
+                                logger.info("Dry run mode: Stop loss sell order simulated.")
+                            else:
+                                sell_order = await loop.run_in_executor(
+                                    None, partial(client.order_market_sell, symbol=args.symbol, quantity=base_balance))
+                            sell_revenue = float(sell_order['cummulativeQuoteQty'])
+                            fee = FEE_PERCENTAGE * sell_revenue
+                            pnl = (sell_revenue - fee) - buy_cost
+                            logger.info(f"PNL: {pnl:.2f} {quote_asset}")
+                            queue_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
+                            buy_amount = 0
+                            buy_cost = 0
+                            buy_price = None
+                            last_cross = 'below'  # reset last_cross to prevent immediate re-buy
+
+                    elif current_price >= buy_price * (1 + args.take_profit_pct):
+                        base_balance = state['balances'].get(base_asset, 0.0)
+                        if base_balance >= min_qty:
+                            base_balance = base_balance - (base_balance % step_size)  # adjust to step size
+                            logger.info(f"{timestamp} - Take profit target reached. Placing a SELL order.")
+                            queue_telegram_message(f"{timestamp} - Take profit target reached. Placing a SELL order.",
+                                                   args.telegram_token, args.telegram_chat_id)
+                            if args.dry_run:
+                                sell_order = {'status': 'FILLED', 'cummulativeQuoteQty': str(base_balance * current_price)}
+                                logger.info("Dry run mode: Take profit sell order simulated.")
+                            else:
+                                sell_order = await loop.run_in_executor(
+                                    None, partial(client.order_market_sell, symbol=args.symbol, quantity=base_balance))
+                            sell_revenue = float(sell_order['cummulativeQuoteQty'])
+                            fee = FEE_PERCENTAGE * sell_revenue
+                            pnl = (sell_revenue - fee) - buy_cost
+                            logger.info(f"PNL: {pnl:.2f} {quote_asset}")
+                            queue_telegram_message(f"PNL: {pnl:.2f} {quote_asset}", args.telegram_token, args.telegram_chat_id)
+                            buy_amount = 0
+                            buy_cost = 0
+                            buy_price = None
+                            last_cross = 'below'  # reset last_cross to prevent immediate re-buy
+
+                print_message = f"{timestamp} - Current Price: {current_price}, Short EMA: {short_ema}, Long EMA: {long_ema}"
+                logger.info(print_message)
+
+                i += 1
+                if i >= args.notify_interval:
+                    queue_telegram_message(print_message, args.telegram_token, args.telegram_chat_id)
+                    i = 0
+
+                # Sleep until next deadline, skipping any slots that were missed instead of catching up
+                now = time.monotonic()
+                if now > next_deadline + sleep_duration:
+                    next_deadline += (now - next_deadline) // sleep_duration * sleep_duration
+                if now < next_deadline:
+                    await asyncio.sleep(next_deadline - now)
+                next_deadline += sleep_duration
+
+            except BinanceAPIException as e:
+                logger.error(f"Binance API Exception: {e}")
+                queue_telegram_message(f"Binance API Exception: {e}", args.telegram_token, args.telegram_chat_id)
+                await asyncio.sleep(60)
+            except BinanceOrderException as e:
+                logger.error(f"Binance Order Exception: {e}")
+                queue_telegram_message(f"Binance Order Exception: {e}", args.telegram_token, args.telegram_chat_id)
+                await asyncio.sleep(60)
+            except requests.exceptions.ReadTimeout:
+                logger.error("Encountered ReadTimeout. Sleeping for a minute before retrying...")
+                queue_telegram_message("Encountered ReadTimeout. Sleeping for a minute before retrying...", args.telegram_token, args.telegram_chat_id)
+                await asyncio.sleep(60)
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}")
+                queue_telegram_message(f"Unexpected error: {e}", args.telegram_token, args.telegram_chat_id)
+                await asyncio.sleep(60)
+    finally:
+        twm.stop()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
 
 ''' 
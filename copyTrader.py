@@ -1,8 +1,12 @@
-import pandas as pd
-import json
-import time
-from textblob import TextBlob
-import ccxt
+import logging
+import asyncio
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+from trading_core.exchange import get_exchange, watch_symbol, seed_windows
+from trading_core.orders import place_order, snipe_symbols
 
 # Configuration
 API_KEY = 'your_api_key'  # Exchange API key
@@ -32,162 +36,26 @@ LOG_FILE_PATH = 'trading_bot.log'  # Path to log file
 
 # Timeframe Configuration
 TIMEFRAME = '1m'  # Default timeframe for fetching candles
-DAILY_TIMEFRAME = '1d'  # Timeframe for daily trend analysis
-VOLATILITY_PERIOD = 20  # Period for volatility calculation
-MOMENTUM_PERIOD = 10  # Period for momentum calculation
 
-# Initialize the exchange outside of conditional block
-exchange = None
-if CCXT_AVAILABLE:
-    exchange = getattr(ccxt, EXCHANGE_ID)({
-        'apiKey': API_KEY,
-        'secret': API_SECRET,
-        'enableRateLimit': True,
-    })
+# Messages are formatted lazily, so hot-path debug logging costs nothing above DEBUG level
+logging.basicConfig(level=getattr(logging, LOG_LEVEL), format='%(asctime)s - %(levelname)s - %(message)s',
+                    handlers=[logging.StreamHandler(), logging.FileHandler(LOG_FILE_PATH)])
+logger = logging.getLogger(__name__)
 
-# Dynamic data population from CSV or JSON
-def fetch_trading_symbols_from_file(file_path, file_type='csv'):
-    """Fetch and filter trading symbols from a file (CSV or JSON)."""
-    try:
-        if file_type == 'csv':
-            df = pd.read_csv(file_path)
-            symbols = df['symbol'].tolist()
-        elif file_type == 'json':
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                symbols = data.get('symbols', [])
-        else:
-            raise ValueError("Unsupported file type. Use 'csv' or 'json'.")
-
-        print(f"Fetched {len(symbols)} symbols from {file_path}.")
-        return symbols
-    except Exception as e:
-        print(f"Error fetching symbols from file: {e}")
-        return []
-
-# Load symbols dynamically from a file (replace 'symbols.csv' with your file path)
-tokens = fetch_trading_symbols_from_file('symbols.csv', file_type='csv')
-
-# Ensure fallback logic in case file-based fetching fails
-if not tokens:
-    print("Failed to load symbols from file. Falling back to default dynamic fetching.")
-    def fetch_trading_symbols(quote_currency='USDT', max_symbols=10):
-        """Fetch and filter trading symbols dynamically from the exchange."""
-        if not exchange:
-            print("Exchange is not initialized. Cannot fetch symbols.")
-            return []
-
-        try:
-            exchange.load_markets()
-            symbols = [symbol for symbol in exchange.symbols if symbol.endswith(f"/{quote_currency}")]
-            print(f"Fetched {len(symbols)} symbols matching {quote_currency}.")
-            return symbols[:max_symbols]  # Limit the number of symbols
-        except Exception as e:
-            print(f"Error fetching trading symbols: {e}")
-            return []
-
-    tokens = fetch_trading_symbols()
-
-# Initialize data structure
-data = {
-    'symbol': tokens,
-    'open_side': [None] * len(tokens),
-    'index_pos': list(range(len(tokens))),
-    'open_size': [0] * len(tokens),
-    'open_bool': [False] * len(tokens),
-    'long': [None] * len(tokens)
-}
-positions_df = pd.DataFrame(data)
-
-# Helper functions
-
-def fetch_latest_candle(symbol, timeframe=TIMEFRAME):
-    """Fetch the latest candle for the given symbol and timeframe."""
-    if not exchange:
-        print("Exchange is not initialized. Cannot fetch candle data.")
-        return None
-    candles = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=2)
-    return candles[-1]  # Return the most recent candle
-
-def calculate_daily_trend(symbol):
-    """Analyze the daily trend for better-informed trading decisions."""
-    if not exchange:
-        print("Exchange is not initialized. Cannot calculate daily trend.")
-        return None
-    candles = exchange.fetch_ohlcv(symbol, timeframe=DAILY_TIMEFRAME, limit=5)  # Fetch last 5 daily candles
-    if len(candles) < 5:
-        return None
-
-    # Simple trend analysis: compare the closing prices over 5 days
-    closes = [c[4] for c in candles]
-    trend = "up" if closes[-1] > closes[0] else "down"
-    print(f"Daily trend for {symbol}: {trend}")
-    return trend
-
-def calculate_volatility(prices, period=VOLATILITY_PERIOD):
-    """Calculate volatility using standard deviation."""
-    if len(prices) < period:
-        return None
-    return pd.Series(prices).pct_change().rolling(period).std().iloc[-1]
-
-def calculate_rsi(prices, period=14):
-    """Calculate the Relative Strength Index (RSI)."""
-    if len(prices) < period:
-        return None
-
-    gains = [prices[i] - prices[i - 1] for i in range(1, len(prices)) if prices[i] > prices[i - 1]]
-    losses = [prices[i - 1] - prices[i] for i in range(1, len(prices)) if prices[i] < prices[i - 1]]
+# Every strategy in the process shares this one client, its candle cache and its request budget
+exchange = get_exchange(EXCHANGE_ID, API_KEY, API_SECRET)
 
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
-
-    if avg_loss == 0:
-        return 100
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def perform_sentiment_analysis(text):
-    """Perform sentiment analysis on a given text."""
-    analysis = TextBlob(text)
-    sentiment = analysis.sentiment.polarity
-    return sentiment
-
-def calculate_momentum(prices, period=MOMENTUM_PERIOD):
-    """Calculate momentum for trend-following logic."""
-    if len(prices) < period:
-        return None
-    return prices[-1] - prices[-period]  # Momentum as price difference
-
-def place_order(side, amount, symbol):
-    """Place a market order."""
-    if not exchange:
-        print("Exchange is not initialized. Cannot place order.")
-        return None
-    try:
-        order = exchange.create_order(
-            symbol=symbol,
-            type='market',
-            side=side,
-            amount=amount
-        )
-        return order
-    except Exception as e:
-        print(f"Error placing {side} order: {e}")
-        return None
-
-def monitor_copy_trade_wallets():
+async def monitor_copy_trade_wallets():
     """Monitor selected wallets and copy their trades."""
-    print("Monitoring wallets for copy trading...")
+    logger.info("Monitoring wallets for copy trading...")
     for wallet in COPY_TRADE_WALLETS:
         try:
             trades = get_wallet_trades(wallet)  # Fetch trades from blockchain
             for trade in trades:
-                print(f"Wallet {wallet} executed trade: {trade}")
-                place_order(trade['side'], trade['amount'], trade['symbol'])
+                logger.info("Wallet %s executed trade: %s", wallet, trade)
+                await place_order(trade['side'], trade['amount'], trade['symbol'])
         except Exception as e:
-            print(f"Error monitoring wallet {wallet}: {e}")
+            logger.error("Error monitoring wallet %s: %s", wallet, e)
 
 def get_wallet_trades(wallet):
     """Fetch trades from the blockchain for a given wallet."""
@@ -207,68 +75,38 @@ def get_wallet_trades(wallet):
                 })
         return trades
     except Exception as e:
-        print(f"Error fetching trades for wallet {wallet}: {e}")
+        logger.error("Error fetching trades for wallet %s: %s", wallet, e)
         return []
 
-def pairs_trading(symbols):
-    """Execute pairs trading strategy based on price spreads."""
-    prices = [fetch_latest_candle(symbol)[4] for symbol in symbols]
-    if len(prices) == 2:
-        spread = prices[0] - prices[1]
-        print(f"Pair Spread: {spread}")
-        if spread > PAIR_SPREAD_THRESHOLD:  # Arbitrary threshold
-            print("Spread too wide: Short first asset, Long second asset")
-            place_order('sell', TRADE_AMOUNT, symbols[0])
-            place_order('buy', TRADE_AMOUNT, symbols[1])
-        elif spread < -PAIR_SPREAD_THRESHOLD:
-            print("Spread too negative: Long first asset, Short second asset")
-            place_order('buy', TRADE_AMOUNT, symbols[0])
-            place_order('sell', TRADE_AMOUNT, symbols[1])
-
-def find_open_positions(df):
-    """Find positions where open_bool is True and return the symbols."""
-    open_positions = df[df['open_bool'] == True]
-    symbols = open_positions['symbol'].tolist()
-    print(f"Open positions found: {symbols}")
-    return symbols
-
-def token_sniping(symbols):
+async def token_sniping(symbols):
     """Sniping logic to monitor tokens for specific conditions."""
-    for symbol in symbols:
-        candle = fetch_latest_candle(symbol)
-        if candle is None:
-            continue
-        price_change = ((candle[4] - candle[1]) / candle[1]) * 100  # % price change
-        volume_spike = candle[5] / sum([c[5] for c in exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, limit=20)])  # Volume spike ratio
-
-        if price_change >= SNIPING_CONDITIONS["price_change"]:
-            print(f"Sniping opportunity detected for {symbol}: Price change {price_change:.2f}%")
-            place_order('buy', TRADE_AMOUNT, symbol)
-
-        if volume_spike >= SNIPING_CONDITIONS["volume_spike"]:
-            print(f"Volume spike detected for {symbol}: {volume_spike:.2f}x average volume")
-            place_order('buy', TRADE_AMOUNT, symbol)
-
-def dollar_cost_averaging(symbol):
-    """Implement Dollar-Cost Averaging (DCA) logic."""
-    print(f"Executing DCA for {symbol} with amount {DCA_AMOUNT}")
-    place_order('buy', DCA_AMOUNT, symbol)
-
-pnl_tracker = {"realized_pnl": 0.0, "unrealized_pnl": 0.0}
-
-def update_pnl(symbol, entry_price, current_price, amount, side):
-    """Update PnL tracking."""
-    if side == "buy":
-        pnl_tracker["unrealized_pnl"] = (current_price - entry_price) * amount
-    elif side == "sell":
-        pnl_tracker["realized_pnl"] += (current_price - entry_price) * amount
-    print(f"PnL Update: Realized: {pnl_tracker['realized_pnl']:.2f}, Unrealized: {pnl_tracker['unrealized_pnl']:.2f}")
-
-def trading_logic():
+    # One stream per symbol; pushed candle updates are checked as they arrive instead of polling
+    await seed_windows(symbols, TIMEFRAME)
+    updates = asyncio.Queue()
+    watchers = [asyncio.create_task(watch_symbol(symbol, TIMEFRAME, updates)) for symbol in symbols]
+    try:
+        while True:
+            # Updates that arrived in the meantime are scanned in the same pass
+            updated = {await updates.get()}
+            while not updates.empty():
+                updated.add(updates.get_nowait())
+            await snipe_symbols(list(updated), TRADE_AMOUNT, SNIPING_CONDITIONS)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+
+async def trading_logic():
     """Main trading logic with enhanced features."""
-    print("Starting trading bot...")
-    monitor_copy_trade_wallets()
-    # Add additional logic for trading here
+    logger.info("Starting trading bot...")
+    try:
+        await monitor_copy_trade_wallets()
+        # Add additional logic for trading here
+    finally:
+        await exchange.close()
 
 if __name__ == "__main__":
-    trading_logic()
+    # uvloop's libuv event loop handles the socket I/O faster than the default asyncio loop
+    if UVLOOP_AVAILABLE:
+        uvloop.run(trading_logic())
+    else:
+        asyncio.run(trading_logic())
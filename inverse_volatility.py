@@ -10,22 +10,35 @@ It fetches historical data, calculates volatilities, determines allocation ratio
 
 Prerequisites:
 - Python 3.7+
-- Required Libraries: yfinance, alpaca-trade-api, schedule
+- Required Libraries: yfinance, alpaca-trade-api, schedule, pyarrow (close cache)
+- Optional: httpx[http2] (concurrent order submission), numba (fused volatility kernel)
 - Alpaca Account with API keys(https://alpaca.markets/)
 """
 
 import argparse
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import math
 import numpy as np
+import pandas as pd
 import time
 import sys
 import yfinance as yf
 import logging
-import concurrent.futures
 import schedule
 import alpaca_trade_api as tradeapi
 import os
+import asyncio
+import importlib.util
+try:
+    from numba import guvectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+try:
+    import httpx
+    HTTPX_AVAILABLE = importlib.util.find_spec('h2') is not None  # Required by httpx for HTTP/2
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 # Configuration and Logging
 logging.basicConfig(
@@ -33,6 +46,7 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s:%(levelname)s:%(message)s'
 )
+CLOSE_CACHE_DIR = os.path.expanduser('~/.cache/ivbot')
 
 # Argument Parsing
 def parse_arguments():
@@ -73,73 +87,183 @@ def parse_arguments():
                         help='Alpaca API Secret Key (overrides environment variable)')
     return parser.parse_args()
 
+# Cached Daily Closes
+class CloseCache:
+    """
+    Daily closes per symbol, held in memory and on disk, so each cycle only downloads the
+    days added since the previous one.
+    """
+
+    def __init__(self, cache_dir=CLOSE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.closes = {}  # symbol -> pd.Series of closes indexed by date
+
+    def _path(self, symbol):
+        return os.path.join(self.cache_dir, f"{symbol}.feather")
+
+    def _load(self, symbol):
+        if symbol not in self.closes:
+            path = self._path(symbol)
+            if os.path.exists(path):
+                self.closes[symbol] = pd.read_feather(path).set_index('Date')['Close']
+            else:
+                self.closes[symbol] = pd.Series(dtype=np.float64)
+        return self.closes[symbol]
+
+    def _download(self, symbols, **kwargs):
+        # One request for every symbol instead of one round-trip per ticker, parsing only adjusted prices
+        data = yf.download(' '.join(symbols), interval="1d", auto_adjust=True, actions=False, threads=True,
+                           progress=False, **kwargs)
+        if data.empty:
+            return {}
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            # Older yfinance versions return flat columns for a single ticker
+            closes = closes.to_frame(symbols[0])
+        return {symbol: closes[symbol].dropna() for symbol in symbols if symbol in closes}
+
+    def get(self, symbols, window_size):
+        """
+        Returns the daily closes of the given symbols, downloading only what the cache is missing.
+
+        Parameters:
+            symbols (list): The ticker symbols to fetch data for.
+            window_size (int): The number of days to calculate volatility and performance.
+
+        Returns:
+            pd.DataFrame: Closes with one column per symbol, ordered like symbols.
+        """
+        today = date.today()
+        # Adjusted history shifts after splits and dividends, so old caches are downloaded again in full
+        expired = today - timedelta(days=window_size * 4)
+        stale = []
+        fresh = []
+        for symbol in symbols:
+            cached = self._load(symbol)
+            if cached.empty or cached.index[0].date() < expired:
+                stale.append(symbol)
+            else:
+                fresh.append(symbol)
+
+        updates = {}
+        if stale:
+            updates.update(self._download(stale, period=f"{int((window_size + 10))}d"))
+        if fresh:
+            # Refetch from the last cached day, whose bar may still have been forming when it was stored
+            start = min(self.closes[symbol].index[-1] for symbol in fresh)
+            updates.update(self._download(fresh, start=start.date(), end=today + timedelta(days=1)))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for symbol, closes in updates.items():
+            if closes.empty:
+                continue
+            if symbol in fresh:
+                cached = self.closes[symbol]
+                closes = pd.concat([cached[cached.index < closes.index[0]], closes])
+            self.closes[symbol] = closes
+            closes.rename('Close').rename_axis('Date').reset_index().to_feather(self._path(symbol))
+
+        return pd.DataFrame({symbol: self.closes[symbol] for symbol in symbols}, columns=symbols)
+
+close_cache = CloseCache()
+
+# Fused Volatility and Performance Kernel
+if NUMBA_AVAILABLE:
+    @guvectorize(['void(f8[:], i8, i8, f8[:], f8[:])'], '(t),(),()->(),()', target='parallel', cache=True)
+    def volatility_and_performance(closes, window_size, num_trading_days, volatility, performance):
+        """
+        Annualized volatility and window performance of one symbol's closes, taking each log
+        return once into a small window buffer; broadcast over rows of an (N, T) close matrix.
+        """
+        n = closes.shape[0]
+        log_returns = np.empty(window_size)
+        total = 0.0
+        for i in range(window_size):
+            k = n - window_size - 1 + i
+            log_returns[i] = math.log(closes[k] / closes[k + 1])
+            total += log_returns[i]
+        mean = total / window_size
+        sq = 0.0
+        for i in range(window_size):
+            d = log_returns[i] - mean
+            sq += d * d
+        volatility[0] = math.sqrt(sq / (window_size - 1)) * math.sqrt(num_trading_days)
+        performance[0] = closes[n - 1] / closes[n - window_size - 1] - 1.0
+
 # Fetch and Calculate Volatility and Performance
-def get_volatility_and_performance(symbol, window_size=20, num_trading_days=252):
+def get_volatility_and_performance(symbols, window_size=20, num_trading_days=252):
     """
-    Fetches historical price data for the given symbol, calculates the annualized volatility
-    and performance over the specified window size.
+    Fetches historical price data for all symbols through the close cache, calculates the
+    annualized volatility and performance of each over the specified window size.
 
     Parameters:
-        symbol (str): The ticker symbol to fetch data for.
+        symbols (list): The ticker symbols to fetch data for.
         window_size (int): The number of days to calculate volatility and performance.
         num_trading_days (int): Number of trading days in a year for annualization.
 
     Returns:
-        tuple: (volatility, performance)
+        tuple: (volatilities, performances), each an array ordered like symbols
     """
     try:
-        # Fetch historical data
-        data = yf.download(symbol, period=f"{int((window_size + 10))}d", interval="1d", progress=False)
-        if data.empty:
-            raise ValueError(f"No data fetched for symbol: {symbol}")
-        close_prices = data['Close'].dropna().values
-        if len(close_prices) < window_size + 1:
-            raise ValueError(f"Not enough data to calculate volatility for symbol: {symbol}")
-
-        # Calculate log returns
-        log_returns = np.log(close_prices[:-1] / close_prices[1:])
-        volatilities_in_window = log_returns[-window_size:]
-
-        # Calculate annualized volatility
-        volatility = np.std(volatilities_in_window, ddof=1) * np.sqrt(num_trading_days)
-
-        # Calculate performance over the window
-        performance = (close_prices[-1] / close_prices[-window_size -1]) - 1.0
+        closes = close_cache.get(symbols, window_size).dropna()
+        if closes.empty:
+            raise ValueError(f"No data fetched for symbols: {symbols}")
+        if len(closes) < window_size + 1:
+            raise ValueError(f"Not enough data to calculate volatility for symbols: {symbols}")
+        closes = closes.iloc[-(window_size + 1):]
+
+        close_prices = closes.to_numpy(dtype=np.float64)
+
+        if NUMBA_AVAILABLE:
+            # One fused kernel call over all symbols, one row per symbol
+            volatilities, performances = volatility_and_performance(
+                np.ascontiguousarray(close_prices.T), window_size, num_trading_days)
+        else:
+            # Calculate log returns for every symbol at once, one column per symbol, in a single buffer
+            log_returns = np.empty_like(close_prices[:-1])
+            np.divide(close_prices[:-1], close_prices[1:], out=log_returns)
+            np.log(log_returns, out=log_returns)
+
+            # Calculate annualized volatility
+            volatilities = log_returns[-window_size:].std(axis=0, ddof=1) * np.sqrt(num_trading_days)
+
+            # Calculate performance over the window
+            performances = close_prices[-1] / close_prices[-window_size - 1] - 1.0
 
         # Check the most recent date
-        most_recent_date = data.index[-1].date()
+        most_recent_date = closes.index[-1].date()
         if (date.today() - most_recent_date).days > 4:
             raise ValueError(f"Today is {date.today()}, but most recent trading day is {most_recent_date}")
 
-        return volatility, performance
+        return volatilities, performances
     except Exception as e:
-        logging.error(f"Error fetching data for {symbol}: {e}")
+        logging.error(f"Error fetching data for {symbols}: {e}")
         raise
 
 # Fetch Data with Retries
-def fetch_data_with_retries(symbol, window_size=20, retries=3, delay=5, num_trading_days=252):
+def fetch_data_with_retries(symbols, window_size=20, retries=3, delay=5, num_trading_days=252):
     """
     Attempts to fetch data with retries in case of transient failures.
 
     Parameters:
-        symbol (str): The ticker symbol.
+        symbols (list): The ticker symbols.
         window_size (int): Window size for calculations.
         retries (int): Number of retry attempts.
-        delay (int): Delay between retries in seconds.
+        delay (int): Delay before the first retry in seconds, doubled on every further attempt.
         num_trading_days (int): Number of trading days in a year.
 
     Returns:
-        tuple: (volatility, performance)
+        tuple: (volatilities, performances)
     """
     for attempt in range(retries):
         try:
-            return get_volatility_and_performance(symbol, window_size, num_trading_days)
+            return get_volatility_and_performance(symbols, window_size, num_trading_days)
         except Exception as e:
-            logging.warning(f"Attempt {attempt +1} failed for {symbol}: {e}")
+            logging.warning(f"Attempt {attempt +1} failed for {symbols}: {e}")
             if attempt < retries -1:
-                time.sleep(delay)
+                time.sleep(delay * 2 ** attempt)
             else:
-                logging.error(f"All retries failed for {symbol}. Skipping.")
+                logging.error(f"All retries failed for {symbols}.")
                 raise
 
 # Rebalance Portfolio Based on Inverse Volatility
@@ -148,17 +272,48 @@ def rebalance_portfolio(volatilities):
     Calculates allocation ratios inversely proportional to volatilities.
 
     Parameters:
-        volatilities (list): List of volatilities for each symbol.
+        volatilities (np.ndarray): Volatilities for each symbol.
+
+    Returns:
+        np.ndarray: Allocation ratios for each symbol.
+    """
+    inverse_volatility = 1.0 / np.asarray(volatilities)
+    return inverse_volatility / inverse_volatility.sum()
+
+# Two-Symbol Allocation
+def _rebalance_two(volatilities):
+    """
+    Closed-form inverse-volatility allocation for exactly two symbols (the default UPRO,TMF).
+
+    Parameters:
+        volatilities (np.ndarray): Volatilities of the two symbols.
 
     Returns:
         list: Allocation ratios for each symbol.
     """
-    sum_inverse_volatility = sum(1.0 / vol for vol in volatilities)
-    allocation_ratios = [(1.0 / vol) / sum_inverse_volatility for vol in volatilities]
-    return allocation_ratios
+    v1, v2 = volatilities
+    total = v1 + v2
+    return [v2 / total, v1 / total]
+
+# Submit Orders Concurrently over HTTP/2
+async def submit_all(credentials, orders):
+    """
+    Submits all orders at once, multiplexed over a single HTTP/2 connection.
+
+    Parameters:
+        credentials (tuple): (base_url, api_key, api_secret) of the Alpaca account.
+        orders (list): Order payloads for Alpaca's /v2/orders endpoint.
+
+    Returns:
+        list: The response (or exception) of each order, in the order submitted.
+    """
+    base_url, api_key, api_secret = credentials
+    headers = {'APCA-API-KEY-ID': api_key, 'APCA-API-SECRET-KEY': api_secret}
+    async with httpx.AsyncClient(base_url=base_url, http2=True, headers=headers) as client:
+        return await asyncio.gather(*(client.post('/v2/orders', json=order) for order in orders), return_exceptions=True)
 
 # Execute Trades via Alpaca API
-def execute_trades(api, symbols, allocation_ratios, transaction_cost=0.001):
+def execute_trades(api, symbols, allocation_ratios, transaction_cost=0.001, credentials=None):
     """
     Executes trades to adjust portfolio allocations based on calculated ratios.
 
@@ -167,40 +322,47 @@ def execute_trades(api, symbols, allocation_ratios, transaction_cost=0.001):
         symbols (list): List of ticker symbols.
         allocation_ratios (list): Allocation ratios for each symbol.
         transaction_cost (float): Estimated transaction cost rate per trade.
+        credentials (tuple): (base_url, api_key, api_secret); when given and httpx is installed,
+            orders are submitted concurrently instead of one by one.
     """
     try:
         account = api.get_account()
         portfolio_value = float(account.cash)  # Simplistic approach; consider using total portfolio value
 
+        # One request each for all open positions and the latest trade of every symbol
+        pos_qty = {pos.symbol: float(pos.qty) for pos in api.list_positions()}
+        snapshots = api.get_snapshots(symbols)
+
+        orders = []
         for symbol, ratio in zip(symbols, allocation_ratios):
             target_value = portfolio_value * ratio
-            current_position = api.get_position(symbol).qty if symbol in [pos.symbol for pos in api.list_positions()] else 0.0
-            current_price = float(api.get_last_trade(symbol).price)
+            current_position = pos_qty.get(symbol, 0.0)
+            current_price = snapshots[symbol].latest_trade.price
             target_qty = target_value / current_price
-            order_qty = math.floor(abs(target_qty - float(current_position)))
+            order_qty = math.floor(abs(target_qty - current_position))
 
-            if target_qty > float(current_position):
+            if target_qty > current_position:
                 if order_qty > 0:
-                    api.submit_order(
-                        symbol=symbol,
-                        qty=order_qty,
-                        side='buy',
-                        type='market',
-                        time_in_force='gtc'
-                    )
-                    logging.info(f"Placed buy order for {order_qty} shares of {symbol}")
-            elif target_qty < float(current_position):
+                    orders.append({'symbol': symbol, 'qty': order_qty, 'side': 'buy', 'type': 'market', 'time_in_force': 'gtc'})
+            elif target_qty < current_position:
                 if order_qty > 0:
-                    api.submit_order(
-                        symbol=symbol,
-                        qty=order_qty,
-                        side='sell',
-                        type='market',
-                        time_in_force='gtc'
-                    )
-                    logging.info(f"Placed sell order for {order_qty} shares of {symbol}")
+                    orders.append({'symbol': symbol, 'qty': order_qty, 'side': 'sell', 'type': 'market', 'time_in_force': 'gtc'})
             else:
                 logging.info(f"No trade needed for {symbol}")
+
+        if HTTPX_AVAILABLE and credentials and orders:
+            payloads = [dict(order, qty=str(order['qty'])) for order in orders]
+            responses = asyncio.run(submit_all(credentials, payloads))
+            for order, response in zip(orders, responses):
+                if isinstance(response, Exception) or response.is_error:
+                    error = response if isinstance(response, Exception) else response.text
+                    logging.error(f"Error placing {order['side']} order for {order['symbol']}: {error}")
+                else:
+                    logging.info(f"Placed {order['side']} order for {order['qty']} shares of {order['symbol']}")
+        else:
+            for order in orders:
+                api.submit_order(**order)
+                logging.info(f"Placed {order['side']} order for {order['qty']} shares of {order['symbol']}")
     except Exception as e:
         logging.error(f"Error executing trades: {e}")
 
@@ -220,7 +382,7 @@ def log_allocation(symbols, allocation_ratios, volatilities, performances):
         logging.info(f"{symbol} allocation: {ratio*100:.2f}%, Volatility: {vol:.2f}%, Performance: {perf*100:.2f}%")
 
 # Main Trading Logic
-def trade(api, symbols, window_size, num_trading_days, transaction_cost):
+def trade(api, symbols, window_size, num_trading_days, transaction_cost, credentials=None):
     """
     Executes the main trading cycle: fetch data, calculate allocations, execute trades.
 
@@ -230,44 +392,32 @@ def trade(api, symbols, window_size, num_trading_days, transaction_cost):
         window_size (int): Window size for calculations.
         num_trading_days (int): Number of trading days in a year.
         transaction_cost (float): Estimated transaction cost rate per trade.
+        credentials (tuple): (base_url, api_key, api_secret) for concurrent order submission.
     """
     logging.info("Starting trading cycle")
-    results = {}
     try:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(fetch_data_with_retries, symbol, window_size, 3, 5, num_trading_days): symbol
-                for symbol in symbols
-            }
-            for future in concurrent.futures.as_completed(futures):
-                symbol = futures[future]
-                try:
-                    volatility, performance = future.result()
-                    results[symbol] = {'volatility': volatility, 'performance': performance}
-                except Exception as e:
-                    logging.error(f"Failed to process {symbol}: {e}")
-
-        volatilities = [results[symbol]['volatility'] for symbol in symbols]
-        performances = [results[symbol]['performance'] for symbol in symbols]
-        allocation_ratios = rebalance_portfolio(volatilities)
+        volatilities, performances = fetch_data_with_retries(symbols, window_size, 3, 5, num_trading_days)
+        # Two symbols (the default UPRO,TMF) take the closed-form allocation
+        allocate = _rebalance_two if len(symbols) == 2 else rebalance_portfolio
+        allocation_ratios = allocate(volatilities)
 
         log_allocation(symbols, allocation_ratios, volatilities, performances)
 
-        execute_trades(api, symbols, allocation_ratios, transaction_cost)
+        execute_trades(api, symbols, allocation_ratios, transaction_cost, credentials)
         logging.info("Completed trading cycle")
     except Exception as e:
         logging.error(f"Trading cycle failed: {e}")
 
-# Initialize Alpaca API
-def initialize_alpaca(args):
+# Resolve Alpaca Credentials
+def get_alpaca_credentials(args):
     """
-    Initializes the Alpaca API client using environment variables or command-line arguments.
+    Reads the Alpaca credentials from command-line arguments or environment variables.
 
     Parameters:
         args (argparse.Namespace): Parsed command-line arguments.
 
     Returns:
-        tradeapi.REST: Initialized Alpaca API client.
+        tuple: (base_url, api_key, api_secret)
     """
     base_url = args.base_url or os.getenv('APCA_API_BASE_URL')
     api_key = args.api_key or os.getenv('APCA_API_KEY_ID')
@@ -277,10 +427,24 @@ def initialize_alpaca(args):
         logging.error("Alpaca API credentials are not fully provided.")
         sys.exit("Error: Alpaca API credentials are missing. Set them as environment variables or provide via command-line arguments.")
 
+    return base_url, api_key, api_secret
+
+# Initialize Alpaca API
+def initialize_alpaca(credentials):
+    """
+    Initializes the Alpaca API client from the resolved credentials.
+
+    Parameters:
+        credentials (tuple): (base_url, api_key, api_secret) from get_alpaca_credentials.
+
+    Returns:
+        tradeapi.REST: Initialized Alpaca API client.
+    """
+    base_url, api_key, api_secret = credentials
     return tradeapi.REST(api_key, api_secret, base_url, api_version='v2')
 
 # Schedule Trading
-def schedule_trading(api, symbols, window_size, num_trading_days, transaction_cost):
+def schedule_trading(api, symbols, window_size, num_trading_days, transaction_cost, credentials=None):
     """
     Schedules the trading function to run at a specified time daily.
 
@@ -290,6 +454,7 @@ def schedule_trading(api, symbols, window_size, num_trading_days, transaction_co
         window_size (int): Window size for calculations.
         num_trading_days (int): Number of trading days in a year.
         transaction_cost (float): Estimated transaction cost rate per trade.
+        credentials (tuple): (base_url, api_key, api_secret) for concurrent order submission.
     """
     schedule.every().day.at("16:00").do(
         trade, 
@@ -297,13 +462,19 @@ def schedule_trading(api, symbols, window_size, num_trading_days, transaction_co
         symbols=symbols, 
         window_size=window_size, 
         num_trading_days=num_trading_days, 
-        transaction_cost=transaction_cost
+        transaction_cost=transaction_cost,
+        credentials=credentials
     )
     logging.info("Scheduled trading to run daily at 16:00")
 
+    # Sleep until the next job is due instead of polling every second
     while True:
+        idle = schedule.idle_seconds()
+        if idle is None:
+            break
+        if idle > 0:
+            time.sleep(idle)
         schedule.run_pending()
-        time.sleep(1)
 
 # Main Function
 if __name__ == "__main__":
@@ -317,14 +488,15 @@ if __name__ == "__main__":
     logging.info("Inverse Volatility Trading Bot Started")
     logging.info(f"Symbols: {symbols}, Window Size: {window_size}, Trading Days/Year: {num_trading_days}")
 
-    # Initialize Alpaca API
-    alpaca_api = initialize_alpaca(args)
+    # Resolve the credentials once for the Alpaca client and the concurrent order submission
+    credentials = get_alpaca_credentials(args)
+    alpaca_api = initialize_alpaca(credentials)
 
     # Execute an initial trading cycle
     try:
-        trade(alpaca_api, symbols, window_size, num_trading_days, transaction_cost)
+        trade(alpaca_api, symbols, window_size, num_trading_days, transaction_cost, credentials)
     except Exception as e:
         logging.error(f"Initial trading cycle failed: {e}")
 
     # Schedule future trading cycles
-    schedule_trading(alpaca_api, symbols, window_size, num_trading_days, transaction_cost)
+    schedule_trading(alpaca_api, symbols, window_size, num_trading_days, transaction_cost, credentials)
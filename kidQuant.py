@@ -1,7 +1,25 @@
+import math
+import numpy as np
 import pandas as pd
 import time
-from textblob import TextBlob
-import ccxt
+import asyncio
+from collections import deque
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:
+    from textblob import TextBlob
+    VADER_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Run the kernel as plain Python when Numba is not installed."""
+        return lambda func: func
+import ccxt.pro as ccxtpro
 
 # Configuration
 API_KEY = 'your_api_key'
@@ -15,8 +33,12 @@ TAKE_PROFIT_PERCENT = 1.5  # Take profit percentage
 STOP_LOSS_PERCENT = 1.0  # Stop loss percentage
 MOMENTUM_PERIOD = 10  # Period for trend-following logic
 VOLATILITY_PERIOD = 20  # Period for volatility calculation
+RSI_PERIOD = 14  # Period for RSI calculation
 VOLATILITY_THRESHOLD = 0.015  # Threshold for high volatility
 PAIR_SYMBOLS = ['ETH/USDT', 'BTC/USDT', 'LTC/USDT', 'BNB/USDT']  # Pairs for trading
+SCAN_WINDOW = 50  # Closes kept per pair symbol for the indicator scan
+FAILED_FETCH_BACKOFF = 5  # Initial seconds to skip a symbol after a failed fetch
+FAILED_FETCH_MAX_BACKOFF = 300  # Cap on the doubling backoff for failing symbols
 PAIR_SPREAD_THRESHOLD = 30  # Spread threshold for pairs trading
 DCA_INTERVAL = 300  # Time interval in seconds for DCA
 DCA_AMOUNT = 0.001  # Amount to buy/sell in each DCA iteration
@@ -28,38 +50,53 @@ SNIPING_CONDITIONS = {
 # Initialize the exchange outside of conditional block
 exchange = None
 if CCXT_AVAILABLE:
-    exchange = getattr(ccxt, EXCHANGE_ID)({
+    # One async client (ccxt.pro builds on ccxt.async_support) streams candles and serves every REST call
+    exchange = getattr(ccxtpro, EXCHANGE_ID)({
         'apiKey': API_KEY,
         'secret': API_SECRET,
         'enableRateLimit': True,
     })
 
-# Sample DataFrame for positions
-data = {
-    'symbol': ['ZILUSD', 'DYDXUSD', 'LTCUSD', 'SOLUSD', 'BNBUSD', 'XRPUSD', 'ETHUSD'],
-    'open_side': [None, None, None, None, None, None, 'Buy'],
-    'index_pos': [0, 1, 2, 3, 4, 5, 11],
-    'open_size': [0, 0, 0, 0, 0, 0, 2],
-    'open_bool': [False, False, False, False, False, False, True],
-    'long': [None, None, None, None, None, None, True]
+# Sample positions, one typed array per field
+positions = {
+    'symbol': np.array(['ZILUSD', 'DYDXUSD', 'LTCUSD', 'SOLUSD', 'BNBUSD', 'XRPUSD', 'ETHUSD']),
+    'open_side': np.array([None, None, None, None, None, None, 'Buy'], dtype=object),
+    'index_pos': np.array([0, 1, 2, 3, 4, 5, 11], dtype=np.int32),
+    'open_size': np.array([0, 0, 0, 0, 0, 0, 2], dtype=np.float32),
+    'open_bool': np.array([False, False, False, False, False, False, True]),
+    'long': np.array([None, None, None, None, None, None, True], dtype=object),
 }
-positions_df = pd.DataFrame(data)
+
+# Symbols whose last candle fetch failed: symbol -> (retry_at, backoff, reason)
+_failed_fetches = {}
 
 # Helper functions
-def fetch_latest_candle(symbol, timeframe=TIMEFRAME):
+async def fetch_latest_candle(symbol, timeframe=TIMEFRAME):
     """Fetch the latest candle for the given symbol and timeframe."""
     if not exchange:
         print("Exchange is not initialized. Cannot fetch candle data.")
         return None
-    candles = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=2)
+    # Known-bad symbols are skipped until their backoff expires instead of paying a round trip every cycle
+    now = time.time()
+    failure = _failed_fetches.get(symbol)
+    if failure and now < failure[0]:
+        return None
+    try:
+        candles = await exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=2)
+    except Exception as e:
+        backoff = min(FAILED_FETCH_MAX_BACKOFF, failure[1] * 2) if failure else FAILED_FETCH_BACKOFF
+        _failed_fetches[symbol] = (now + backoff, backoff, str(e))
+        print(f"Error fetching candle for {symbol}, skipping it for {backoff}s: {e}")
+        return None
+    _failed_fetches.pop(symbol, None)
     return candles[-1]  # Return the most recent candle
 
-def calculate_daily_trend(symbol):
+async def calculate_daily_trend(symbol):
     """Analyze the daily trend for better-informed trading decisions."""
     if not exchange:
         print("Exchange is not initialized. Cannot calculate daily trend.")
         return None
-    candles = exchange.fetch_ohlcv(symbol, timeframe=DAILY_TIMEFRAME, limit=5)  # Fetch last 5 daily candles
+    candles = await exchange.fetch_ohlcv(symbol, timeframe=DAILY_TIMEFRAME, limit=5)  # Fetch last 5 daily candles
     if len(candles) < 5:
         return None
 
@@ -69,22 +106,35 @@ def calculate_daily_trend(symbol):
     print(f"Daily trend for {symbol}: {trend}")
     return trend
 
+async def fetch_latest_candles(symbols, candles=None):
+    """Fetch the latest candle of each symbol once, skipping symbols whose candle is already held."""
+    candles = dict(candles or {})
+    missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in candles]
+    # Request the missing candles concurrently so the fetch costs ~one round trip
+    fetched = await asyncio.gather(*(fetch_latest_candle(symbol) for symbol in missing))
+    candles.update(zip(missing, fetched))
+    return candles
+
 def calculate_volatility(prices, period=VOLATILITY_PERIOD):
-    """Calculate volatility using standard deviation."""
-    if len(prices) < period:
+    """Calculate volatility as the standard deviation of the last `period` log returns."""
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.size <= period:
         return None
-    return pd.Series(prices).pct_change().rolling(period).std().iloc[-1]
+    log_returns = np.diff(np.log(prices[-(period + 1):]))
+    return float(log_returns.std(ddof=1))
 
 def calculate_rsi(prices, period=14):
-    """Calculate the Relative Strength Index (RSI)."""
-    if len(prices) < period:
+    """Calculate the Relative Strength Index (RSI) with Wilder's smoothing."""
+    if len(prices) <= period:
         return None
 
-    gains = [prices[i] - prices[i - 1] for i in range(1, len(prices)) if prices[i] > prices[i - 1]]
-    losses = [prices[i - 1] - prices[i] for i in range(1, len(prices)) if prices[i] < prices[i - 1]]
+    deltas = np.diff(np.asarray(prices, dtype=np.float64))
+    gains = np.maximum(deltas, 0.0)
+    losses = -np.minimum(deltas, 0.0)
 
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
+    # Seed with the SMA of the first period, then fold the rest with Wilder's RMA (alpha = 1/period)
+    avg_gain = pd.Series(np.r_[gains[:period].mean(), gains[period:]]).ewm(alpha=1 / period, adjust=False).mean().iloc[-1]
+    avg_loss = pd.Series(np.r_[losses[:period].mean(), losses[period:]]).ewm(alpha=1 / period, adjust=False).mean().iloc[-1]
 
     if avg_loss == 0:
         return 100
@@ -93,8 +143,86 @@ def calculate_rsi(prices, period=14):
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
+class RSIState:
+    """Incremental Wilder RSI that folds in one close per update."""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.prev_price = None
+        self.seeded_count = 0
+
+    def update(self, price):
+        """Fold a new closing price into the averages and return the RSI (None while seeding)."""
+        if self.prev_price is None:
+            self.prev_price = price
+            return None
+
+        gain = max(0.0, price - self.prev_price)
+        loss = max(0.0, self.prev_price - price)
+        self.prev_price = price
+
+        if self.seeded_count < self.period:
+            # Seed with the simple average of the first period deltas
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            self.seeded_count += 1
+            if self.seeded_count < self.period:
+                return None
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if self.avg_loss == 0:
+            return 100
+
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+class VolatilityState:
+    """Rolling standard deviation of log returns, updated in O(1) per close (Welford)."""
+
+    def __init__(self, period=VOLATILITY_PERIOD):
+        self.period = period
+        self.returns = deque(maxlen=period)
+        self.prev_price = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, price):
+        """Fold a new closing price into the window and return the volatility (None until the window is full)."""
+        if self.prev_price is None:
+            self.prev_price = price
+            return None
+
+        ret = math.log(price / self.prev_price)
+        self.prev_price = price
+
+        # Remove the return that is about to drop out of the window
+        if len(self.returns) == self.period:
+            old = self.returns[0]
+            n = len(self.returns)
+            old_mean = self.mean
+            self.mean = (n * old_mean - old) / (n - 1) if n > 1 else 0.0
+            self.m2 -= (old - old_mean) * (old - self.mean)
+
+        self.returns.append(ret)
+        delta = ret - self.mean
+        self.mean += delta / len(self.returns)
+        self.m2 += delta * (ret - self.mean)
+
+        if len(self.returns) < self.period:
+            return None
+        return (max(self.m2, 0.0) / (self.period - 1)) ** 0.5
+
+# The VADER lexicon is loaded once and the analyzer reused for every headline
+_vader = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+
 def perform_sentiment_analysis(text):
     """Perform sentiment analysis on a given text."""
+    if VADER_AVAILABLE:
+        return _vader.polarity_scores(text)['compound']
     analysis = TextBlob(text)
     sentiment = analysis.sentiment.polarity
     return sentiment
@@ -105,13 +233,68 @@ def calculate_momentum(prices, period=MOMENTUM_PERIOD):
         return None
     return prices[-1] - prices[-period]  # Momentum as price difference
 
-def place_order(side, amount, symbol):
+@njit(cache=True, fastmath=True)
+def compute_all(prices_2d, rsi_period, momentum_period, volatility_period):
+    """Calculate RSI, momentum and log-return volatility for every row of a (symbols, window) close matrix."""
+    n_symbols, window = prices_2d.shape
+    rsi = np.empty(n_symbols)
+    momentum = np.empty(n_symbols)
+    volatility = np.empty(n_symbols)
+
+    for i in range(n_symbols):
+        row = prices_2d[i]
+
+        # Wilder RSI: SMA seed over the first period deltas, then RMA over the rest
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for j in range(1, window):
+            delta = row[j] - row[j - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if j <= rsi_period:
+                avg_gain += gain / rsi_period
+                avg_loss += loss / rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+        rsi[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        momentum[i] = row[window - 1] - row[window - momentum_period]
+
+        # Two-pass sample standard deviation of the last volatility_period log returns
+        mean = 0.0
+        for j in range(window - volatility_period, window):
+            mean += np.log(row[j] / row[j - 1])
+        mean /= volatility_period
+        m2 = 0.0
+        for j in range(window - volatility_period, window):
+            d = np.log(row[j] / row[j - 1]) - mean
+            m2 += d * d
+        volatility[i] = np.sqrt(m2 / (volatility_period - 1))
+
+    return rsi, momentum, volatility
+
+class PriceWindow:
+    """Preallocated (symbols, window) matrix of closes, oldest column first."""
+
+    def __init__(self, n_symbols, size=SCAN_WINDOW):
+        self.closes = np.zeros((n_symbols, size))
+        self.count = 0
+
+    def push(self, latest):
+        """Shift in the latest close of every symbol and return True once the window is full."""
+        self.closes[:, :-1] = self.closes[:, 1:]
+        self.closes[:, -1] = latest
+        self.count = min(self.count + 1, self.closes.shape[1])
+        return self.count == self.closes.shape[1]
+
+async def place_order(side, amount, symbol):
     """Place a market order."""
     if not exchange:
         print("Exchange is not initialized. Cannot place order.")
         return None
     try:
-        order = exchange.create_order(
+        order = await exchange.create_order(
             symbol=symbol,
             type='market',
             side=side,
@@ -122,49 +305,64 @@ def place_order(side, amount, symbol):
         print(f"Error placing {side} order: {e}")
         return None
 
-def pairs_trading(symbols):
+async def pairs_trading(symbols, candles, window=None):
     """Execute pairs trading strategy based on price spreads."""
-    prices = [fetch_latest_candle(symbol)[4] for symbol in symbols]
+    # Only candles not already held this cycle are requested
+    candles = await fetch_latest_candles(symbols, candles)
+    if any(candles[symbol] is None for symbol in symbols):
+        return
+    prices = [candles[symbol][4] for symbol in symbols]
+
+    # One compiled pass computes the indicators of every symbol once the window is full
+    if window is not None and window.push(prices):
+        rsi, momentum, volatility = compute_all(window.closes, RSI_PERIOD, MOMENTUM_PERIOD, VOLATILITY_PERIOD)
+        for symbol, r, m, v in zip(symbols, rsi, momentum, volatility):
+            print(f"{symbol} - RSI: {r:.2f}, Momentum: {m:.4f}, Volatility: {v:.5f}")
     if len(prices) == 2:
         spread = prices[0] - prices[1]
         print(f"Pair Spread: {spread}")
         if spread > PAIR_SPREAD_THRESHOLD:  # Arbitrary threshold
             print("Spread too wide: Short first asset, Long second asset")
-            place_order('sell', TRADE_AMOUNT, symbols[0])
-            place_order('buy', TRADE_AMOUNT, symbols[1])
+            await asyncio.gather(place_order('sell', TRADE_AMOUNT, symbols[0]),
+                                 place_order('buy', TRADE_AMOUNT, symbols[1]))
         elif spread < -PAIR_SPREAD_THRESHOLD:
             print("Spread too negative: Long first asset, Short second asset")
-            place_order('buy', TRADE_AMOUNT, symbols[0])
-            place_order('sell', TRADE_AMOUNT, symbols[1])
+            await asyncio.gather(place_order('buy', TRADE_AMOUNT, symbols[0]),
+                                 place_order('sell', TRADE_AMOUNT, symbols[1]))
 
-def find_open_positions(df):
+def find_open_positions(pos):
     """Find positions where open_bool is True and return the symbols."""
-    open_positions = df[df['open_bool'] == True]
-    symbols = open_positions['symbol'].tolist()
+    idx = np.flatnonzero(pos['open_bool'])
+    symbols = pos['symbol'][idx].tolist()
+    for symbol, index_pos, open_side in zip(symbols, pos['index_pos'][idx], pos['open_side'][idx]):
+        print(f"Symbol: {symbol}, index_pos: {index_pos}, side: {open_side}")
     print(f"Open positions found: {symbols}")
     return symbols
 
-def token_sniping(symbols):
+async def snipe_symbol(symbol, candle):
+    """Check one token for the sniping conditions."""
+    if candle is None:
+        return
+    window = await exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, limit=20)
+    price_change = ((candle[4] - candle[1]) / candle[1]) * 100  # % price change
+    volume_spike = candle[5] / sum([c[5] for c in window])  # Volume spike ratio
+
+    if price_change >= SNIPING_CONDITIONS["price_change"]:
+        print(f"Sniping opportunity detected for {symbol}: Price change {price_change:.2f}%")
+        await place_order('buy', TRADE_AMOUNT, symbol)
+
+    if volume_spike >= SNIPING_CONDITIONS["volume_spike"]:
+        print(f"Volume spike detected for {symbol}: {volume_spike:.2f}x average volume")
+        await place_order('buy', TRADE_AMOUNT, symbol)
+
+async def token_sniping(symbols, candles):
     """Sniping logic to monitor tokens for specific conditions."""
-    for symbol in symbols:
-        candle = fetch_latest_candle(symbol)
-        if candle is None:
-            continue
-        price_change = ((candle[4] - candle[1]) / candle[1]) * 100  # % price change
-        volume_spike = candle[5] / sum([c[5] for c in exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, limit=20)])  # Volume spike ratio
-
-        if price_change >= SNIPING_CONDITIONS["price_change"]:
-            print(f"Sniping opportunity detected for {symbol}: Price change {price_change:.2f}%")
-            place_order('buy', TRADE_AMOUNT, symbol)
-
-        if volume_spike >= SNIPING_CONDITIONS["volume_spike"]:
-            print(f"Volume spike detected for {symbol}: {volume_spike:.2f}x average volume")
-            place_order('buy', TRADE_AMOUNT, symbol)
-
-def dollar_cost_averaging(symbol):
+    await asyncio.gather(*(snipe_symbol(symbol, candles[symbol]) for symbol in symbols))
+
+async def dollar_cost_averaging(symbol):
     """Implement Dollar-Cost Averaging (DCA) logic."""
     print(f"Executing DCA for {symbol} with amount {DCA_AMOUNT}")
-    place_order('buy', DCA_AMOUNT, symbol)
+    await place_order('buy', DCA_AMOUNT, symbol)
 
 pnl_tracker = {"realized_pnl": 0.0, "unrealized_pnl": 0.0}
 
@@ -176,73 +374,78 @@ def update_pnl(symbol, entry_price, current_price, amount, side):
         pnl_tracker["realized_pnl"] += (current_price - entry_price) * amount
     print(f"PnL Update: Realized: {pnl_tracker['realized_pnl']:.2f}, Unrealized: {pnl_tracker['unrealized_pnl']:.2f}")
 
-def trading_logic():
+async def trading_logic():
     """Main trading logic with enhanced features."""
-    prices = []
-    open_positions = find_open_positions(positions_df)
+    # Only the tail needed by momentum is kept; RSI and volatility carry their own state
+    prices = deque(maxlen=MOMENTUM_PERIOD + 1)
+    rsi_state = RSIState(RSI_PERIOD)
+    vol_state = VolatilityState()
+    pair_window = PriceWindow(len(PAIR_SYMBOLS))
+    open_positions = find_open_positions(positions)
 
     news_headline = "Bitcoin rally continues as institutional interest surges."
     sentiment = perform_sentiment_analysis(news_headline)
     print(f"Sentiment Analysis on news headline: {sentiment}")
 
-    daily_trend = calculate_daily_trend(SYMBOL)
+    daily_trend = await calculate_daily_trend(SYMBOL)
 
     last_dca_time = time.time()
 
-    while True:
-        try:
-            # Sniping logic
-            token_sniping(PAIR_SYMBOLS)
-
-            # Fetch the latest candle
-            candle = fetch_latest_candle(SYMBOL)
-            if candle is None:
-                print("No candle data available. Skipping iteration.")
-                time.sleep(5)
-                continue
-
-            close_price = candle[4]  # Closing price
-            prices.append(close_price)
-
-            # DCA logic
-            if time.time() - last_dca_time >= DCA_INTERVAL:
-                dollar_cost_averaging(SYMBOL)
-                last_dca_time = time.time()
-
-            # Ensure we have enough data for calculations
-            if len(prices) > MOMENTUM_PERIOD:
-                rsi = calculate_rsi(prices)
-                momentum = calculate_momentum(prices)
-                volatility = calculate_volatility(prices)
-
-                print(f"RSI: {rsi}, Momentum: {momentum}, Volatility: {volatility}, Daily Trend: {daily_trend}")
-
-                # Volatility arbitrage
-                if volatility is not None and volatility > VOLATILITY_THRESHOLD:
-                    print(f"High volatility detected ({volatility}): Placing trades.")
-                    place_order('buy', TRADE_AMOUNT, SYMBOL)
-
-                # Trend-following conditions (momentum-based)
-                if momentum > 0 and sentiment > 0 and daily_trend == "up":
-                    print(f"Momentum {momentum}: Buying signal with positive sentiment ({sentiment}) and upward trend.")
-                    entry_price = close_price
-                    place_order('buy', TRADE_AMOUNT, SYMBOL)
-                    update_pnl(SYMBOL, entry_price, close_price, TRADE_AMOUNT, "buy")
-                elif momentum < 0 and sentiment < 0 and daily_trend == "down":
-                    print(f"Momentum {momentum}: Selling signal with negative sentiment ({sentiment}) and downward trend.")
-                    entry_price = close_price
-                    place_order('sell', TRADE_AMOUNT, SYMBOL)
-                    update_pnl(SYMBOL, entry_price, close_price, TRADE_AMOUNT, "sell")
-
-                # Pairs trading logic
-                pairs_trading(PAIR_SYMBOLS)
-
-            time.sleep(exchange.rateLimit / 1000 if CCXT_AVAILABLE else 5)
-
-        except Exception as e:
-            print(f"Error in trading logic: {e}")
-            time.sleep(5)
+    try:
+        while True:
+            try:
+                # Candles are pushed over the WebSocket as they update; no polling or sleep needed
+                ohlcv = await exchange.watch_ohlcv(SYMBOL, TIMEFRAME)
+                candle = ohlcv[-1]
+
+                # Each symbol's latest candle is fetched once per cycle and shared by sniping and pairs trading
+                candles = await fetch_latest_candles(PAIR_SYMBOLS, {SYMBOL: candle})
+
+                # Sniping logic
+                await token_sniping(PAIR_SYMBOLS, candles)
+
+                close_price = candle[4]  # Closing price
+                prices.append(close_price)
+                rsi = rsi_state.update(close_price)
+                volatility = vol_state.update(close_price)
+
+                # DCA logic
+                if time.time() - last_dca_time >= DCA_INTERVAL:
+                    await dollar_cost_averaging(SYMBOL)
+                    last_dca_time = time.time()
+
+                # Ensure we have enough data for calculations
+                if len(prices) > MOMENTUM_PERIOD:
+                    momentum = calculate_momentum(prices)
+
+                    print(f"RSI: {rsi}, Momentum: {momentum}, Volatility: {volatility}, Daily Trend: {daily_trend}")
+
+                    # Volatility arbitrage
+                    if volatility is not None and volatility > VOLATILITY_THRESHOLD:
+                        print(f"High volatility detected ({volatility}): Placing trades.")
+                        await place_order('buy', TRADE_AMOUNT, SYMBOL)
+
+                    # Trend-following conditions (momentum-based)
+                    if momentum > 0 and sentiment > 0 and daily_trend == "up":
+                        print(f"Momentum {momentum}: Buying signal with positive sentiment ({sentiment}) and upward trend.")
+                        entry_price = close_price
+                        await place_order('buy', TRADE_AMOUNT, SYMBOL)
+                        update_pnl(SYMBOL, entry_price, close_price, TRADE_AMOUNT, "buy")
+                    elif momentum < 0 and sentiment < 0 and daily_trend == "down":
+                        print(f"Momentum {momentum}: Selling signal with negative sentiment ({sentiment}) and downward trend.")
+                        entry_price = close_price
+                        await place_order('sell', TRADE_AMOUNT, SYMBOL)
+                        update_pnl(SYMBOL, entry_price, close_price, TRADE_AMOUNT, "sell")
+
+                    # Pairs trading logic
+                    await pairs_trading(PAIR_SYMBOLS, candles, pair_window)
+
+            except Exception as e:
+                print(f"Error in trading logic: {e}")
+                await asyncio.sleep(5)
+    finally:
+        await exchange.close()
 
 if __name__ == '__main__':
     print("Starting trading bot...")
-    trading_logic()
+    asyncio.run(trading_logic())
@@ -1,86 +1,154 @@
 # Import necessary libraries
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import yfinance as yf
-import statsmodels.api as sm
 from statsmodels.tsa.stattools import coint, adfuller
 from statsmodels.stats.multitest import multipletests
 import matplotlib.pyplot as plt
 import seaborn as sns
 import datetime
+import functools
+import hashlib
+import math
+import os
+import time
 import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Run the kernel as plain Python when Numba is not installed."""
+        return lambda func: func
 warnings.filterwarnings("ignore")
 
+CACHE_DIR = os.path.expanduser('~/.cache/pairs')  # Cached symbol list and price downloads
+SP500_CACHE_TTL = 7 * 86400  # Seconds the cached S&P 500 symbol list is reused
+
 # Set display options for DataFrames
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', 100)
 
 # Function to download S&P 500 symbols
+@functools.lru_cache(maxsize=1)
 def get_sp500_symbols():
+    # Reuse the list saved by a recent run; index membership rarely changes
+    path = os.path.join(CACHE_DIR, 'sp500_symbols.csv')
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < SP500_CACHE_TTL:
+        return pd.read_csv(path)['Symbol'].tolist()
     # Fetch the list from Wikipedia
     table = pd.read_html('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies')
     df = table[0]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df[['Symbol']].to_csv(path, index=False)
     symbols = df['Symbol'].tolist()
     return symbols
 
 # Function to download historical data for symbols
 def download_data(symbols, start_date, end_date):
-    data = {}
-    for symbol in symbols:
-        try:
-            # Fetch adjusted close prices
-            df = yf.download(symbol, start=start_date, end=end_date)
-            data[symbol] = df['Adj Close']
-        except Exception as e:
-            print(f"Could not download data for {symbol}: {e}")
-    prices = pd.DataFrame(data)
+    key = hashlib.md5(' '.join(symbols).encode()).hexdigest()
+    path = os.path.join(CACHE_DIR, f"prices_{start_date}_{end_date}_{key}.pkl")
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    # Fetch adjusted close prices for all symbols in one request
+    prices = yf.download(symbols, start=start_date, end=end_date, auto_adjust=True, actions=False,
+                         threads=True, progress=False)['Close']
+    # A range that has fully closed never changes, so it is kept for the next run, unless a symbol
+    # came back empty (e.g. throttled) and would otherwise stay missing on every later run
+    if pd.Timestamp(end_date) < pd.Timestamp.today().normalize() and not prices.isna().all().any():
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        prices.to_pickle(path)
     return prices
 
+# Price matrix of a coint worker process, handed over once by the pool initializer
+_coint_prices = None
+
+def _init_coint_worker(prices):
+    global _coint_prices
+    _coint_prices = prices
+
+# Function to run coint on a chunk of (i, j) column pairs inside a worker process
+def _coint_chunk(pair_indices):
+    return [(i, j, coint(_coint_prices[:, i], _coint_prices[:, j])[1]) for i, j in pair_indices]
+
 # Function to find cointegrated pairs with multiple testing correction
-def find_cointegrated_pairs(data, significance=0.05):
+def find_cointegrated_pairs(data, significance=0.05, min_correlation=0.8):
     n = data.shape[1]
-    pvalue_matrix = np.ones((n, n))
     keys = data.columns
+    X = data.to_numpy(dtype=np.float64)
     pairs = []
-    pvalues = []
-    indices = []
-
-    # Collect all p-values
-    for i in range(n):
-        for j in range(i+1, n):
-            S1 = data.iloc[:, i]
-            S2 = data.iloc[:, j]
-            result = coint(S1, S2)
-            pvalue = result[1]
-            pvalue_matrix[i, j] = pvalue
-            pvalues.append(pvalue)
-            indices.append((i, j))
-
-    # Adjust p-values for multiple testing
+
+    # One flat slot per pair (i < j), in row-major upper-triangle order
+    pair_ij = np.column_stack(np.triu_indices(n, k=1))
+    pvalues = np.ones(len(pair_ij))
+
+    # Prescreen: only highly correlated pairs go on to the full Engle-Granger test
+    i_idx, j_idx = pair_ij[:, 0], pair_ij[:, 1]
+    correlation = np.corrcoef(X.T)[i_idx, j_idx]
+    keep = np.abs(correlation) >= min_correlation
+    i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+    # OLS of every surviving S1 on S2 with a constant, solved for all pairs at once
+    x = X[:, j_idx] - X[:, j_idx].mean(axis=0)
+    y = X[:, i_idx] - X[:, i_idx].mean(axis=0)
+    beta = np.einsum('tp,tp->p', x, y) / np.einsum('tp,tp->p', x, x)
+    resid = y - beta * x
+
+    # Residuals whose AR(1) slope is not negative do not mean-revert and cannot be cointegrated
+    lag = resid[:-1] - resid[:-1].mean(axis=0)
+    step = np.diff(resid, axis=0)
+    slope = np.einsum('tp,tp->p', lag, step - step.mean(axis=0)) / np.einsum('tp,tp->p', lag, lag)
+    keep = slope < 0
+    i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+    # Collect p-values of the survivors across all cores; screened-out pairs keep a p-value of 1
+    pair_indices = list(zip(i_idx.tolist(), j_idx.tolist()))
+    if pair_indices:
+        workers = os.cpu_count() or 1
+        chunks = [pair_indices[k::workers] for k in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_coint_worker, initargs=(X,)) as executor:
+            for chunk in executor.map(_coint_chunk, chunks, chunksize=1):
+                for i, j, pvalue in chunk:
+                    pvalues[i * (2 * n - i - 1) // 2 + (j - i - 1)] = pvalue
+
+    # Adjust p-values for multiple testing over every pair, screened or not
     _, corrected_pvalues, _, _ = multipletests(pvalues, alpha=significance, method='fdr_bh')
 
     # Extract pairs with significant cointegration
-    for k in range(len(corrected_pvalues)):
-        if corrected_pvalues[k] < significance:
-            i, j = indices[k]
-            pairs.append((keys[i], keys[j]))
+    for i, j in pair_ij[corrected_pvalues < significance]:
+        pairs.append((keys[i], keys[j]))
+
+    return pvalues, pair_ij, pairs
+
+# Function to expand flat pair p-values into the upper triangle of an n x n matrix
+def pvalue_matrix(pvalues, pair_ij, n):
+    matrix = np.ones((n, n))
+    matrix[pair_ij[:, 0], pair_ij[:, 1]] = pvalues
+    return matrix
 
-    return pvalue_matrix, pairs
+# Function to compute the OLS slope of y on x with a constant, in closed form
+@njit(cache=True)
+def ols_slope(x, y):
+    mx = x.mean()
+    my = y.mean()
+    return ((x - mx) * (y - my)).sum() / ((x - mx) ** 2).sum()
 
 # Function to calculate the hedge ratio and spread
 def calculate_spread(S1, S2):
-    S1 = S1.dropna()
-    S2 = S2.dropna()
+    S1 = np.asarray(S1, dtype=np.float64)
+    S2 = np.asarray(S2, dtype=np.float64)
+    S1 = S1[~np.isnan(S1)]
+    S2 = S2[~np.isnan(S2)]
     min_len = min(len(S1), len(S2))
     S1 = S1[-min_len:]
     S2 = S2[-min_len:]
-    S1 = S1.values
-    S2 = S2.values
-    # Add a constant to S2
-    S2_const = sm.add_constant(S2)
-    # Perform linear regression
-    model = sm.OLS(S1, S2_const).fit()
-    hedge_ratio = model.params[1]
+    # Regress S1 on S2 (with a constant); the slope is the hedge ratio
+    hedge_ratio = ols_slope(S2, S1)
     spread = S1 - hedge_ratio * S2
     return spread, hedge_ratio
 
@@ -90,52 +158,121 @@ def check_stationarity(spread):
     p_value = adf_result[1]
     return p_value < 0.05  # Returns True if spread is stationary
 
+# Function to compute the AR(1) slope of a spread's changes on its lagged level, without temporaries
+@njit(cache=True)
+def ar1_slope(spread):
+    n = len(spread) - 1
+    mx = 0.0
+    my = 0.0
+    for k in range(n):
+        mx += spread[k]
+        my += spread[k + 1] - spread[k]
+    mx /= n
+    my /= n
+    cov = 0.0
+    var = 0.0
+    for k in range(n):
+        dx = spread[k] - mx
+        cov += dx * (spread[k + 1] - spread[k] - my)
+        var += dx * dx
+    if var == 0:
+        return 0.0
+    return cov / var
+
 # Function to calculate half-life of mean reversion
 def half_life(spread):
-    spread_lag = np.roll(spread, 1)
-    spread_ret = spread - spread_lag
-    spread_lag = spread_lag[1:]
-    spread_ret = spread_ret[1:]
-    spread_lag_const = sm.add_constant(spread_lag)
-    model = sm.OLS(spread_ret, spread_lag_const).fit()
-    halflife = -np.log(2) / model.params[1]
+    # Regress the spread changes on the lagged spread (with a constant)
+    slope = ar1_slope(np.asarray(spread, dtype=np.float64))
+    if not slope < 0:
+        return 0  # Not mean-reverting, so there is no finite half-life
+    halflife = -np.log(2) / slope
     return int(round(halflife))
 
 # Function to generate trading signals
 def generate_signals(spread, window):
-    rolling_mean = pd.Series(spread).rolling(window=window).mean()
-    rolling_std = pd.Series(spread).rolling(window=window).std()
-    z_score = (pd.Series(spread) - rolling_mean) / rolling_std
-    signals = pd.Series(index=z_score.index)
-    signals[z_score > 1] = -1  # Sell signal
-    signals[z_score < -1] = 1   # Buy signal
-    signals[(z_score > -0.5) & (z_score < 0.5)] = 0  # Exit signal
-    signals = signals.fillna(method='ffill').fillna(0)
-    return signals, z_score
+    spread = np.asarray(spread, dtype=np.float64)
+    z_score = np.full(len(spread), np.nan)
+    # A window longer than the spread leaves every z-score NaN and every signal flat, like rolling() did
+    if window <= len(spread):
+        windows = sliding_window_view(spread, window)
+        z_score[window - 1:] = (spread[window - 1:] - windows.mean(axis=1)) / windows.std(axis=1, ddof=1)
+    # Sell above 1, buy below -1, exit inside +-0.5, otherwise hold the previous signal
+    signals = np.where(z_score > 1, -1.0, np.where(z_score < -1, 1.0, np.where(np.abs(z_score) < 0.5, 0.0, np.nan)))
+    signals = pd.Series(signals).ffill().fillna(0)
+    return signals, pd.Series(z_score)
+
+# Function to run the backtest in one pass, stopping at the first drawdown beyond the stop-loss
+@njit(cache=True)
+def run_backtest(s1, s2, sig, hedge_ratio, transaction_cost, stop_loss):
+    n = len(s1)
+    cumulative = np.empty(n)
+    cumulative[0] = 1.0
+    cum = 1.0
+    peak = 1.0
+    for t in range(1, n):
+        r1 = s1[t] / s1[t - 1] - 1
+        r2 = s2[t] / s2[t - 1] - 1
+        # Short or long S1, long or short S2 scaled by the hedge ratio; each leg pays costs on its change
+        trade = abs(sig[t] - sig[t - 1])
+        ret = -sig[t] * r1 + sig[t] * hedge_ratio * r2 - trade * (abs(r1) + abs(hedge_ratio) * abs(r2)) * transaction_cost
+        cum *= 1 + ret
+        cumulative[t] = cum
+        if cum > peak:
+            peak = cum
+        if (peak - cum) / peak > stop_loss:
+            return cumulative[:t + 1], t
+    return cumulative, -1
+
+# Rolling z-score signal for live use, updated per new spread sample
+class OnlineSignal:
+    """Same signal as generate_signals, kept current in O(1) per spread sample (Welford with removal)."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.signal = 0
+
+    def update(self, x):
+        """Fold in a new spread sample and return (signal, z_score); z is NaN until the window is full."""
+        # Remove the sample that is about to drop out of the window
+        if len(self.values) == self.window:
+            old = self.values[0]
+            n = len(self.values)
+            old_mean = self.mean
+            self.mean = (n * old_mean - old) / (n - 1) if n > 1 else 0.0
+            self.m2 -= (old - old_mean) * (old - self.mean)
+
+        self.values.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 += delta * (x - self.mean)
+
+        if len(self.values) < max(self.window, 2):
+            return self.signal, math.nan
+        std = math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+        if std == 0:
+            return self.signal, math.nan
+        z = (x - self.mean) / std
+        # Buy below -1, sell above 1, exit inside +-0.5, otherwise hold
+        entry = int(z < -1) - int(z > 1)
+        self.signal = entry + (entry == 0) * (abs(z) >= 0.5) * self.signal
+        return self.signal, z
 
 # Function to backtest the strategy
-def backtest(S1, S2, hedge_ratio, signals, initial_investment=100000, transaction_cost=0.0005, stop_loss=0.05):
-    positions = pd.DataFrame(index=signals.index).fillna(0.0)
-    positions['S1'] = -signals * 1  # Short or long S1
-    positions['S2'] = signals * hedge_ratio  # Long or short S2
-    # Compute daily returns
-    S1_ret = S1.pct_change().fillna(0)
-    S2_ret = S2.pct_change().fillna(0)
-    portfolio_returns = positions['S1'] * S1_ret + positions['S2'] * S2_ret
-    # Apply transaction costs
-    trades = positions.diff().fillna(0)
-    transaction_costs = (abs(trades['S1']) * S1_ret.abs() + abs(trades['S2']) * S2_ret.abs()) * transaction_cost
-    portfolio_returns -= transaction_costs
-    # Calculate cumulative returns
-    cumulative_returns = (1 + portfolio_returns).cumprod()
-    # Apply stop-loss
-    drawdown = (cumulative_returns.cummax() - cumulative_returns) / cumulative_returns.cummax()
-    if drawdown.max() > stop_loss:
-        stop_idx = drawdown[drawdown > stop_loss].index[0]
-        cumulative_returns = cumulative_returns[:stop_idx]
-        print(f"Stop-loss triggered on {stop_idx}")
+def backtest(S1, S2, hedge_ratio, signals, initial_investment=100000, transaction_cost=0.0005, stop_loss=0.05, dates=None):
+    if dates is None:
+        dates = S1.index
+    s1 = np.asarray(S1, dtype=np.float64)
+    s2 = np.asarray(S2, dtype=np.float64)
+    sig = np.asarray(signals, dtype=np.float64)
+    cumulative, stop = run_backtest(s1, s2, sig, float(hedge_ratio), transaction_cost, stop_loss)
+    if stop >= 0:
+        print(f"Stop-loss triggered on {dates[stop]}")
+    cumulative_returns = pd.Series(cumulative, index=dates[:len(cumulative)])
     # Calculate final return
-    final_return = cumulative_returns.iloc[-1] * initial_investment
+    final_return = cumulative[-1] * initial_investment
     return cumulative_returns, final_return
 
 # Main execution
@@ -158,17 +295,20 @@ if __name__ == "__main__":
     prices = prices.fillna(method='ffill').dropna(axis=1)
 
     # Step 4: Find cointegrated pairs
-    pvalue_matrix, pairs = find_cointegrated_pairs(prices, significance=significance_level)
+    pvalues, pair_ij, pairs = find_cointegrated_pairs(prices, significance=significance_level)
     print(f"Number of cointegrated pairs found: {len(pairs)}")
     print("Cointegrated pairs:")
     for pair in pairs:
         print(pair)
 
-    # Step 5: Analyze each cointegrated pair
+    # Step 5: Analyze each cointegrated pair on one contiguous price matrix
+    X = np.ascontiguousarray(prices.values, dtype=np.float64)
+    col = {c: i for i, c in enumerate(prices.columns)}
+    dates = prices.index
     results = []
     for pair in pairs:
-        S1 = prices[pair[0]]
-        S2 = prices[pair[1]]
+        S1 = X[:, col[pair[0]]]
+        S2 = X[:, col[pair[1]]]
         spread, hedge_ratio = calculate_spread(S1, S2)
         # Check for stationarity
         if check_stationarity(spread):
@@ -183,7 +323,7 @@ if __name__ == "__main__":
                 S2_train, S2_test = S2[:split], S2[split:]
                 signals_train, signals_test = signals[:split], signals[split:]
                 # Backtest on test data
-                cumulative_returns, final_return = backtest(S1_test, S2_test, hedge_ratio, signals_test)
+                cumulative_returns, final_return = backtest(S1_test, S2_test, hedge_ratio, signals_test, dates=dates[split:])
                 # Store results
                 results.append({
                     'pair': pair,
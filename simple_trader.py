@@ -3,21 +3,41 @@ import numpy as np
 def initialize(state):
     """Initialize strategy variables and preload historical data."""
     state['lookback'] = 20
+    state['short'] = 5
     state['symbol'] = 'AAPL'
     try:
-        state['prices'] = get_historical_prices(state['symbol'], state['lookback'])
+        prices = get_historical_prices(state['symbol'], state['lookback'])
+        # Ring buffer of the last `lookback` prices; state['i'] is the next slot to overwrite
+        state['buf'] = np.array(prices, dtype=np.float64)
+        state['i'] = 0
+        state['sum_long'] = state['buf'].sum()
+        state['sum_short'] = state['buf'][-state['short']:].sum()
         print(f"Loaded historical data for {state['symbol']}.")
     except Exception as e:
         print(f"Error initializing strategy: {e}")
 
+def push_price(price, state):
+    """Add a new price to the ring buffer and update the running SMA sums in O(1)."""
+    buf, lookback, short, i = state['buf'], state['lookback'], state['short'], state['i']
+    slot = i % lookback
+    state['sum_long'] += price - buf[slot]
+    state['sum_short'] += price - buf[(slot - short) % lookback]
+    buf[slot] = price
+    state['i'] = i + 1
+    if state['i'] % lookback == 0:
+        # Resync once per lap so floating-point drift in the running sums cannot build up
+        state['sum_long'] = buf.sum()
+        state['sum_short'] = buf[-short:].sum()
+
 def price_event(price, symbol, state):
     """Evaluate the trading signal and execute trades based on moving averages."""
     try:
-        prices = get_historical_prices(symbol, state['lookback'])
+        if price is not None:
+            push_price(price, state)
 
         # Calculate moving averages
-        sma_short = np.mean(prices[-5:])  # 5-day SMA
-        sma_long = np.mean(prices)        # 20-day SMA
+        sma_short = state['sum_short'] / state['short']  # 5-day SMA
+        sma_long = state['sum_long'] / state['lookback']  # 20-day SMA
 
         # Trading logic
         if sma_short > sma_long:
@@ -47,7 +67,7 @@ def main():
 
     # Simulate price events for testing
     for _ in range(5):
-        price_event(None, state['symbol'], state)
+        price_event(np.random.random() * 100, state['symbol'], state)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1 @@
+"""Exchange access, indicators, positions and orders shared by the ccxt strategy scripts."""
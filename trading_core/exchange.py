@@ -0,0 +1,271 @@
+import numpy as np
+import pandas as pd
+import csv
+import json
+import logging
+import os
+import pickle
+import time
+import asyncio
+from collections import defaultdict, deque
+try:
+    import ccxt.pro as ccxtpro
+    CCXT_AVAILABLE = True
+except ImportError:
+    CCXT_AVAILABLE = False
+
+SNIPING_WINDOW = 20  # Candles kept per symbol, also the span of the volume average
+VOLUME_EWM_ALPHA = 2 / (SNIPING_WINDOW + 1)  # Smoothing factor of the average volume
+CANDLE_CACHE_DIR = '.cache'  # On-disk OHLCV cache
+CANDLE_CACHE_MAX_ROWS = 5000  # Candles kept per symbol and timeframe
+NO_DATA_TTL = 300  # Seconds before a symbol that returned no candles is queried again
+MARKETS_CACHE_TTL = 86400  # Seconds the on-disk copy of exchange.markets is reused
+DAILY_TREND_TTL = 300  # Seconds a computed daily trend is reused
+WEIGHT_CAPACITY = 1200  # Exchange request weight allowed per minute
+KLINES_WEIGHT = 2  # Request weight of one fetch_ohlcv call
+ORDER_WEIGHT = 1  # Request weight of one create_order call
+MARKETS_WEIGHT = 20  # Request weight of load_markets (exchange info)
+TICKERS_WEIGHT = 40  # Request weight of a multi-symbol fetch_tickers call
+
+logger = logging.getLogger(__name__)
+
+# The one client shared by every strategy in the process
+_exchange = None
+
+def get_exchange(exchange_id='binance', api_key=None, secret=None):
+    """Return the shared exchange client, creating it on the first call."""
+    global _exchange
+    if _exchange is None and CCXT_AVAILABLE:
+        # One async client (ccxt.pro builds on ccxt.async_support) streams candles and serves every REST call
+        _exchange = getattr(ccxtpro, exchange_id)({
+            'apiKey': api_key,
+            'secret': secret,
+            # Requests are paced by the WeightBucket below instead of ccxt's fixed per-call delay
+            'enableRateLimit': False,
+        })
+    return _exchange
+
+class WeightBucket:
+    """Token bucket over the exchange's per-minute request weight budget."""
+
+    def __init__(self, capacity=WEIGHT_CAPACITY, refill_per_sec=WEIGHT_CAPACITY / 60):
+        self.capacity = capacity
+        self.base_refill_per_sec = refill_per_sec
+        self.refill_per_sec = refill_per_sec
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.penalty_until = 0.0
+
+    async def acquire(self, weight=1):
+        """Wait until `weight` tokens are available and take them."""
+        while True:
+            now = time.monotonic()
+            if now >= self.penalty_until:
+                self.refill_per_sec = self.base_refill_per_sec
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_sec)
+            self.updated = now
+            if self.tokens >= weight:
+                self.tokens -= weight
+                return
+            await asyncio.sleep((weight - self.tokens) / self.refill_per_sec)
+
+    def throttled(self):
+        """Halve the refill rate for the next minute after the exchange answered 429."""
+        self.refill_per_sec /= 2
+        self.penalty_until = time.monotonic() + 60
+
+weight_bucket = WeightBucket()
+
+async def rest_call(weight, method, *args, **kwargs):
+    """Call an exchange REST method once its request weight fits in the budget."""
+    await weight_bucket.acquire(weight)
+    try:
+        return await method(*args, **kwargs)
+    except ccxtpro.RateLimitExceeded:
+        weight_bucket.throttled()
+        raise
+
+# Dynamic data population from CSV or JSON
+def fetch_trading_symbols_from_file(file_path, file_type='csv'):
+    """Fetch and filter trading symbols from a file (CSV or JSON)."""
+    try:
+        if file_type == 'csv':
+            # A one-column file does not need pandas; read the 'symbol' column with the csv module
+            with open(file_path, newline='') as f:
+                reader = csv.reader(f)
+                column = next(reader).index('symbol')
+                symbols = [row[column] for row in reader if row]
+        elif file_type == 'json':
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+                symbols = data.get('symbols', [])
+        else:
+            raise ValueError("Unsupported file type. Use 'csv' or 'json'.")
+
+        logger.info("Fetched %s symbols from %s.", len(symbols), file_path)
+        return symbols
+    except Exception as e:
+        logger.error("Error fetching symbols from file: %s", e)
+        return []
+
+async def fetch_trading_symbols(quote_currency='USDT', max_symbols=10):
+    """Fetch and filter trading symbols dynamically from the exchange."""
+    exchange = get_exchange()
+    if not exchange:
+        logger.error("Exchange is not initialized. Cannot fetch symbols.")
+        return []
+
+    try:
+        # Reuse the markets from a previous run when fresh; load_markets is one of the slowest startup calls
+        cache_path = os.path.join(CANDLE_CACHE_DIR, f"{exchange.id}_markets.pkl")
+        if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < MARKETS_CACHE_TTL:
+            with open(cache_path, 'rb') as f:
+                exchange.set_markets(pickle.load(f))
+        elif not exchange.markets:
+            await rest_call(MARKETS_WEIGHT, exchange.load_markets)
+            os.makedirs(CANDLE_CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(exchange.markets, f)
+        symbols = [symbol for symbol in exchange.symbols if symbol.rsplit('/', 1)[-1] == quote_currency]
+        logger.info("Fetched %s symbols matching %s.", len(symbols), quote_currency)
+        return symbols[:max_symbols]  # Limit the number of symbols
+    except Exception as e:
+        logger.error("Error fetching trading symbols: %s", e)
+        return []
+
+# Latest candles per symbol, kept current by the watch_ohlcv streams
+candle_windows = defaultdict(lambda: deque(maxlen=SNIPING_WINDOW))
+
+# Exponentially weighted average volume of closed candles per symbol
+avg_volumes = {}
+
+def update_avg_volume(symbol, volume):
+    """Fold a closed candle's volume into the symbol's average volume."""
+    prev = avg_volumes.get(symbol, volume)
+    avg = VOLUME_EWM_ALPHA * volume + (1 - VOLUME_EWM_ALPHA) * prev
+    avg_volumes[symbol] = avg
+    return avg
+
+class CandleCache:
+    """OHLCV history per (symbol, timeframe), held in memory and on disk, extended by fetching only the missing tail."""
+
+    def __init__(self, cache_dir=CANDLE_CACHE_DIR, max_rows=CANDLE_CACHE_MAX_ROWS, no_data_ttl=NO_DATA_TTL):
+        self.cache_dir = cache_dir
+        self.max_rows = max_rows
+        self.no_data_ttl = no_data_ttl
+        self.candles = {}  # (symbol, timeframe) -> (n, 6) float64 array
+        self.no_data = {}  # (symbol, timeframe) -> time until which an empty result is not re-queried
+
+    def _path(self, symbol, timeframe):
+        return os.path.join(self.cache_dir, f"{symbol.replace('/', '_')}_{timeframe}.parquet")
+
+    def _load(self, key):
+        if key not in self.candles:
+            path = self._path(*key)
+            self.candles[key] = pd.read_parquet(path).to_numpy(dtype=np.float64) if os.path.exists(path) else np.empty((0, 6))
+        return self.candles[key]
+
+    async def get(self, symbol, timeframe, n):
+        """Return the last n candles as an (n, 6) array."""
+        key = (symbol, timeframe)
+        cached = self._load(key)
+        if time.time() < self.no_data.get(key, 0):
+            return cached[-n:]
+
+        exchange = get_exchange()
+        timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+        if len(cached) and cached[-1, 0] >= exchange.milliseconds() - n * timeframe_ms:
+            # Refetch from the last cached bar, which may still have been forming when it was stored
+            fetched = await rest_call(KLINES_WEIGHT, exchange.fetch_ohlcv, symbol, timeframe=timeframe, since=int(cached[-1, 0]))
+            kept = cached
+        else:
+            # The cached rows end before this window; replace them rather than keep them behind a gap
+            fetched = await rest_call(KLINES_WEIGHT, exchange.fetch_ohlcv, symbol, timeframe=timeframe, limit=n)
+            kept = cached[:0]
+
+        if not fetched:
+            self.no_data[key] = time.time() + self.no_data_ttl
+            return cached[-n:]
+
+        fetched = np.asarray(fetched, dtype=np.float64)
+        merged = np.concatenate([kept[kept[:, 0] < fetched[0, 0]], fetched])[-self.max_rows:]
+        self.candles[key] = merged
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pd.DataFrame(merged, columns=['ts', 'open', 'high', 'low', 'close', 'volume']).to_parquet(self._path(*key), index=False)
+        return merged[-n:]
+
+candle_cache = CandleCache()
+
+async def watch_symbol(symbol, timeframe, updates):
+    """Stream candles for a symbol into its window and signal each update on the queue."""
+    exchange = get_exchange()
+    window = candle_windows[symbol]
+    while True:
+        try:
+            ohlcv = await exchange.watch_ohlcv(symbol, timeframe)
+        except Exception as e:
+            logger.error("Error watching %s: %s", symbol, e)
+            await asyncio.sleep(5)
+            continue
+
+        # The stream updates the forming candle in place; a new timestamp starts the next one
+        for candle in ohlcv[-2:]:
+            if window and window[-1][0] == candle[0]:
+                window[-1] = candle
+            elif not window or candle[0] > window[-1][0]:
+                if window:
+                    update_avg_volume(symbol, window[-1][5])  # The previous candle has closed
+                window.append(candle)
+        updates.put_nowait(symbol)
+
+async def get_window(symbol, timeframe, sem):
+    """Fetch the last SNIPING_WINDOW candles for a symbol, mostly served from the candle cache."""
+    async with sem:
+        return await candle_cache.get(symbol, timeframe, SNIPING_WINDOW)
+
+async def seed_windows(symbols, timeframe):
+    """Backfill the candle windows over REST so sniping has a full volume window from the first update."""
+    # Requests fan out concurrently, bounded by the exchange's per-second request budget
+    sem = asyncio.Semaphore(max(1, int(1000 / get_exchange().rateLimit)))
+    windows = await asyncio.gather(*(get_window(symbol, timeframe, sem) for symbol in symbols), return_exceptions=True)
+    for symbol, window in zip(symbols, windows):
+        if isinstance(window, Exception):
+            logger.error("Error fetching candles for %s: %s", symbol, window)
+            continue
+        for candle in window[:-1]:
+            update_avg_volume(symbol, candle[5])
+        candle_windows[symbol].extend(window)
+
+def fetch_latest_candle(symbol):
+    """Return the latest streamed candle for the given symbol."""
+    window = candle_windows[symbol]
+    if not window:
+        return None
+    return window[-1]  # Return the most recent candle
+
+# Daily trends per (symbol, TTL window); daily candles barely move minute to minute
+_trend_cache = {}
+
+async def calculate_daily_trend(symbol, timeframe='1d'):
+    """Analyze the daily trend for better-informed trading decisions."""
+    if not get_exchange():
+        logger.error("Exchange is not initialized. Cannot calculate daily trend.")
+        return None
+    window = int(time.time()) // DAILY_TREND_TTL
+    if (symbol, window) in _trend_cache:
+        return _trend_cache[(symbol, window)]
+
+    candles = await candle_cache.get(symbol, timeframe, 5)  # Last 5 daily candles
+    if len(candles) < 5:
+        return None
+
+    # Simple trend analysis: compare the closing prices over 5 days
+    closes = [c[4] for c in candles]
+    trend = "up" if closes[-1] > closes[0] else "down"
+    logger.debug("Daily trend for %s: %s", symbol, trend)
+
+    # Entries from earlier TTL windows can no longer be hit
+    for key in [key for key in _trend_cache if key[1] != window]:
+        del _trend_cache[key]
+    _trend_cache[(symbol, window)] = trend
+    return trend
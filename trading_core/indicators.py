@@ -0,0 +1,102 @@
+import math
+from collections import deque
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:
+    from textblob import TextBlob
+    VADER_AVAILABLE = False
+
+RSI_PERIOD = 14  # Period for RSI calculation
+MOMENTUM_PERIOD = 10  # Period for trend-following logic
+VOLATILITY_PERIOD = 20  # Period for volatility calculation
+
+class RSIState:
+    """Incremental Wilder RSI that folds in one close per update."""
+
+    def __init__(self, period=RSI_PERIOD):
+        self.period = period
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.prev_price = None
+        self.seeded_count = 0
+
+    def update(self, price):
+        """Fold a new closing price into the averages and return the RSI (None while seeding)."""
+        if self.prev_price is None:
+            self.prev_price = price
+            return None
+
+        gain = max(0.0, price - self.prev_price)
+        loss = max(0.0, self.prev_price - price)
+        self.prev_price = price
+
+        if self.seeded_count < self.period:
+            # Seed with the simple average of the first period deltas
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            self.seeded_count += 1
+            if self.seeded_count < self.period:
+                return None
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if self.avg_loss == 0:
+            return 100
+
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+class VolatilityState:
+    """Rolling standard deviation of log returns, updated in O(1) per close (Welford)."""
+
+    def __init__(self, period=VOLATILITY_PERIOD):
+        self.period = period
+        self.returns = deque(maxlen=period)
+        self.prev_price = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, price):
+        """Fold a new closing price into the window and return the volatility (None until the window is full)."""
+        if self.prev_price is None:
+            self.prev_price = price
+            return None
+
+        ret = math.log(price / self.prev_price)
+        self.prev_price = price
+
+        # Remove the return that is about to drop out of the window
+        if len(self.returns) == self.period:
+            old = self.returns[0]
+            n = len(self.returns)
+            old_mean = self.mean
+            self.mean = (n * old_mean - old) / (n - 1) if n > 1 else 0.0
+            self.m2 -= (old - old_mean) * (old - self.mean)
+
+        self.returns.append(ret)
+        delta = ret - self.mean
+        self.mean += delta / len(self.returns)
+        self.m2 += delta * (ret - self.mean)
+
+        if len(self.returns) < self.period:
+            return None
+        return (max(self.m2, 0.0) / (self.period - 1)) ** 0.5
+
+# The VADER lexicon is loaded once and the analyzer reused for every headline
+_vader = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+
+def perform_sentiment_analysis(text):
+    """Perform sentiment analysis on a given text."""
+    if VADER_AVAILABLE:
+        return _vader.polarity_scores(text)['compound']
+    analysis = TextBlob(text)
+    sentiment = analysis.sentiment.polarity
+    return sentiment
+
+def calculate_momentum(prices, period=MOMENTUM_PERIOD):
+    """Calculate momentum for trend-following logic."""
+    if len(prices) < period:
+        return None
+    return prices[-1] - prices[-period]  # Momentum as price difference
@@ -0,0 +1,96 @@
+import numpy as np
+import logging
+import asyncio
+try:
+    import ccxt.pro as ccxtpro
+except ImportError:
+    ccxtpro = None  # get_exchange() returns None, so no order call reaches ccxt
+from trading_core.exchange import (get_exchange, rest_call, candle_windows, avg_volumes, fetch_latest_candle,
+                                   ORDER_WEIGHT, TICKERS_WEIGHT)
+
+logger = logging.getLogger(__name__)
+
+async def place_order(side, amount, symbol):
+    """Place a market order."""
+    exchange = get_exchange()
+    if not exchange:
+        logger.error("Exchange is not initialized. Cannot place order.")
+        return None
+    try:
+        order = await rest_call(
+            ORDER_WEIGHT,
+            exchange.create_order,
+            symbol=symbol,
+            type='market',
+            side=side,
+            amount=amount
+        )
+        return order
+    except Exception as e:
+        logger.error("Error placing %s order: %s", side, e)
+        return None
+
+async def place_orders(legs):
+    """Place market orders for several (side, amount, symbol) legs, batched into one request where supported."""
+    exchange = get_exchange()
+    if not exchange:
+        logger.error("Exchange is not initialized. Cannot place orders.")
+        return None
+    # Binance rejects batched spot orders, so only legs known to be non-spot markets spend weight on a batch call
+    markets = exchange.markets or {}
+    if exchange.has.get('createOrders') and all(markets.get(symbol, {}).get('spot') is False for _, _, symbol in legs):
+        orders = [{'symbol': symbol, 'type': 'market', 'side': side, 'amount': amount} for side, amount, symbol in legs]
+        try:
+            return await rest_call(ORDER_WEIGHT * len(legs), exchange.create_orders, orders)
+        except ccxtpro.NotSupported:
+            pass  # Venue rejected the batch for these markets; fall back to one order per leg
+        except Exception as e:
+            logger.error("Error placing batched orders: %s", e)
+            return None
+    return await asyncio.gather(*(place_order(side, amount, symbol) for side, amount, symbol in legs))
+
+async def pairs_trading(symbols, amount, spread_threshold):
+    """Execute pairs trading strategy based on price spreads."""
+    candles = [fetch_latest_candle(symbol) for symbol in symbols]
+    if None in candles:
+        # Symbols without a stream are priced with one tickers request covering all of them
+        tickers = await rest_call(TICKERS_WEIGHT, get_exchange().fetch_tickers, symbols)
+        prices = np.fromiter((tickers[symbol]['last'] for symbol in symbols), float, count=len(symbols))
+    else:
+        prices = np.fromiter((candle[4] for candle in candles), float, count=len(symbols))
+    if prices.size == 2:
+        spread = prices[0] - prices[1]
+        logger.debug("Pair Spread: %s", spread)
+        if spread > spread_threshold:  # Arbitrary threshold
+            logger.info("Spread too wide: Short first asset, Long second asset")
+            await place_orders([('sell', amount, symbols[0]), ('buy', amount, symbols[1])])
+        elif spread < -spread_threshold:
+            logger.info("Spread too negative: Long first asset, Short second asset")
+            await place_orders([('buy', amount, symbols[0]), ('sell', amount, symbols[1])])
+
+async def snipe_symbols(symbols, amount, conditions):
+    """Check tokens for the sniping conditions against their streamed candles."""
+    symbols = [symbol for symbol in symbols if candle_windows[symbol]]
+    if not symbols:
+        return
+
+    # One vectorized pass over the latest candle of every symbol: open, high, low, close, volume
+    latest = np.array([candle_windows[symbol][-1][1:6] for symbol in symbols], dtype=np.float64)
+    avg_volume = np.array([avg_volumes.get(symbol) or np.nan for symbol in symbols])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = (latest[:, 3] - latest[:, 0]) / latest[:, 0] * 100  # % price change
+        volume_spike = latest[:, 4] / avg_volume  # Volume spike ratio vs average volume
+
+    orders = []
+    for i in np.flatnonzero(price_change >= conditions["price_change"]):
+        logger.info("Sniping opportunity detected for %s: Price change %.2f%%", symbols[i], price_change[i])
+        orders.append(place_order('buy', amount, symbols[i]))
+    for i in np.flatnonzero(volume_spike >= conditions["volume_spike"]):
+        logger.info("Volume spike detected for %s: %.2fx average volume", symbols[i], volume_spike[i])
+        orders.append(place_order('buy', amount, symbols[i]))
+    await asyncio.gather(*orders)
+
+async def dollar_cost_averaging(symbol, amount):
+    """Implement Dollar-Cost Averaging (DCA) logic."""
+    logger.info("Executing DCA for %s with amount %s", symbol, amount)
+    await place_order('buy', amount, symbol)
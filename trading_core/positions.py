@@ -0,0 +1,54 @@
+import numpy as np
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Position sides stored as int8 codes
+SIDE_NONE, SIDE_BUY, SIDE_SELL = 0, 1, 2
+
+class Positions:
+    """Per-token position state as a struct of preallocated, typed NumPy arrays."""
+
+    def __init__(self, tokens):
+        n = len(tokens)
+        self.symbols = np.array(tokens, dtype=object)
+        self.open_side = np.full(n, SIDE_NONE, dtype=np.int8)
+        self.index_pos = np.arange(n, dtype=np.int32)
+        self.open_size = np.zeros(n, dtype=np.float32)
+        self.open_bool = np.zeros(n, dtype=bool)
+        self.long = np.zeros(n, dtype=bool)
+
+    def open_symbols(self, side=None):
+        """Return the symbols with an open position, optionally only those on the given side."""
+        mask = self.open_bool if side is None else self.open_bool & (self.open_side == side)
+        return self.symbols[mask].tolist()
+
+def find_open_positions(positions):
+    """Find positions where open_bool is True and return the symbols."""
+    symbols = positions.open_symbols()
+    logger.info("Open positions found: %s", symbols)
+    return symbols
+
+@dataclass(slots=True)
+class PnLRec:
+    """PnL record of a single symbol."""
+    realized: float = 0.0
+    unrealized: float = 0.0
+    entry_price: float = 0.0
+    amount: float = 0.0
+
+# PnL tracked separately for each symbol
+pnl_tracker = defaultdict(PnLRec)
+
+def update_pnl(symbol, entry_price, current_price, amount, side):
+    """Update PnL tracking."""
+    rec = pnl_tracker[symbol]
+    rec.entry_price = entry_price
+    rec.amount = amount
+    if side == "buy":
+        rec.unrealized = (current_price - entry_price) * amount
+    elif side == "sell":
+        rec.realized += (current_price - entry_price) * amount
+    logger.debug("PnL Update for %s: Realized: %.2f, Unrealized: %.2f", symbol, rec.realized, rec.unrealized)